@@ -7,16 +7,17 @@ Handles animation switching, parameter updates, and frame generation.
 """
 
 import hashlib
+import os
 import time
 import threading
 import traceback
 from collections import deque
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
-from animation_system import AnimationBase, StatefulAnimationBase, AnimationPluginLoader
+from animation_system import AnimationBase, StatefulAnimationBase, AnimationPluginLoader, black_frame, normalize_into
 from led_layout import DEFAULT_STRIP_COUNT, DEFAULT_LEDS_PER_STRIP
-from frame_data_codec import encode_frame_data, FRAME_ENCODING_NAME
+from frame_data_codec import encode_frame_data, unpack_frame_rgb, FRAME_ENCODING_NAME, PACKED_FRAME_TYPES
 
 # Try to import the real LED controller, fall back to mock for testing
 try:
@@ -32,6 +33,8 @@ except ImportError:
                 self.leds_per_strip = leds_per_strip
                 self.total_leds = strips * leds_per_strip
                 self.debug = kwargs.get('debug', False)
+                # Nothing to latch, so the animation loop can skip show()
+                self.inline_show = True
                 print(f"🔧 Mock LED Controller: {strips} strips × {leds_per_strip} LEDs = {self.total_leds} total")
 
             def set_all_pixels(self, pixel_data):
@@ -40,6 +43,11 @@ except ImportError:
                     r, g, b = pixel_data[0]
                     print(f"📊 Frame: First pixel = RGB({r}, {g}, {b})")
 
+            def set_all_pixels_bytes(self, rgb):
+                """Mock set all pixels from a packed R, G, B frame"""
+                if self.debug and len(rgb) >= 3:
+                    print(f"📊 Frame: First pixel = RGB({rgb[0]}, {rgb[1]}, {rgb[2]})")
+
             def show(self):
                 """Mock show"""
                 pass
@@ -54,6 +62,9 @@ except ImportError:
                 pass
 
 
+__all__ = ["AnimationManager", "PreviewLEDController", "LEDController"]
+
+
 class PreviewLEDController:
     """
     Lightweight controller used for preview generation.
@@ -69,6 +80,9 @@ class PreviewLEDController:
     def set_all_pixels(self, *_args, **_kwargs):
         pass
 
+    def set_all_pixels_bytes(self, *_args, **_kwargs):
+        pass
+
     def set_pixel(self, *_args, **_kwargs):
         pass
 
@@ -103,9 +117,29 @@ class AnimationManager:
         "tetris",
         "christmas_tree",
     }
+
+    # Length of each FPS measurement window in nanoseconds
+    FPS_WINDOW_NS = 2_000_000_000
+    # Completed windows averaged into the reported FPS (~6 s horizon)
+    FPS_HISTORY_SIZE = 3
+
+    # Per-frame timing fields, in the order they are stored in the perf ring
+    PERF_KEYS = ('generate', 'send', 'show', 'process', 'sleep', 'frame')
+    PERF_RING_SIZE = 300
+    # Frames of timing samples buffered by the loop before publishing them
+    PERF_BATCH_SIZE = 8
+    # Upper bound on how long stop_animation waits for the loop thread
+    STOP_JOIN_TIMEOUT = 0.25
+    # At or above this target FPS the loop wakes SPIN_WINDOW_NS early and
+    # busy-waits to the frame deadline. Timed waits overshoot by tens of
+    # microseconds, which is jitter at 200 FPS but noise at 40; the spin costs
+    # up to SPIN_WINDOW_NS of CPU per frame, so it stays off at normal rates.
+    SPIN_FPS_THRESHOLD = 100
+    SPIN_WINDOW_NS = 500_000
     
     def __init__(self, controller: LEDController, plugins_dir: str = "animations",
-                 animation_speed_scale: float = 1.0):
+                 animation_speed_scale: float = 1.0, cpu_pin: Optional[int] = None,
+                 realtime_priority: int = 0, preload_plugins: bool = True):
         """
         Initialize animation manager
         
@@ -113,8 +147,16 @@ class AnimationManager:
             controller: LED controller instance
             plugins_dir: Directory containing animation plugins
             animation_speed_scale: Multiplier applied to each animation's speed parameter at start
+            cpu_pin: Optional CPU core to pin the animation thread to (Linux only)
+            realtime_priority: SCHED_RR priority for the animation thread; 0 leaves
+                the default scheduler alone (Linux only, needs privileges)
+            preload_plugins: Import every plugin up front; when False only their
+                metadata is read and each plugin is imported on first use
         """
         self.controller = controller
+        self.cpu_pin = cpu_pin
+        self.realtime_priority = realtime_priority
+        self.preload_plugins = preload_plugins
         self.plugin_loader = AnimationPluginLoader(
             plugins_dir, allowed_plugins=self.ALLOWED_PLUGINS
         )
@@ -123,10 +165,13 @@ class AnimationManager:
         self.current_animation: Optional[AnimationBase] = None
         self.current_animation_name: Optional[str] = None
         self.current_animation_hash: Optional[str] = None
+        # get_info() of the running animation, captured at start and refreshed
+        # when its parameters change, so status polls don't rebuild the schema
+        self._animation_info: Optional[Dict[str, Any]] = None
         self.is_running = False
         self.target_fps = 40
         self.frame_count = 0
-        self.start_time = 0.0
+        self.start_time_ns = 0
         self.animation_speed_scale = animation_speed_scale
         
         # Threading
@@ -134,14 +179,34 @@ class AnimationManager:
         self.stop_event = threading.Event()
         
         # Performance tracking
-        self.frame_timestamps = deque(maxlen=240)  # ~4 seconds at 60 FPS
-        self.perf_samples = deque(maxlen=300)
-        self.perf_lock = threading.Lock()
-        self._last_perf_sample: Dict[str, float] = {}
-
-        # Current frame data for web interface
+        # FPS is counted over fixed windows: frames since the window started,
+        # plus the rates of the last few completed windows and their running sum
+        self._fps_window_start: Optional[int] = None
+        self._fps_last_frame = 0
+        self._fps_window_frames = 0
+        self._fps_history: deque = deque(maxlen=self.FPS_HISTORY_SIZE)
+        self._fps_sum = 0.0
+        # Fixed-size ring of per-frame timing tuples in ns (ordered as PERF_KEYS).
+        # The animation thread is the only writer, so recording takes no lock.
+        self._perf_ring: List[Optional[Tuple[int, ...]]] = [None] * self.PERF_RING_SIZE
+        self._perf_head = 0
+        self._perf_count = 0
+
+        # Current frame data for web interface. The animation loop normalizes
+        # into the back buffer of a preallocated pair and then publishes it by
+        # rebinding current_frame_data, which is atomic under the GIL, so
+        # neither side needs a lock. Animations rendered on the packed path
+        # publish an immutable bytes snapshot instead.
         self.current_frame_data = []
-        self.frame_data_lock = threading.Lock()
+        self._frame_buffers: Tuple[List[Any], List[Any]] = ([], [])
+        self._resize_frame_buffers()
+        # Last encoded frame as (source list, frame_count, encoded, length), so
+        # polls that see no new frame skip the copy and compression
+        self._encoded_frame: Optional[Tuple[List[Any], int, str, int]] = None
+
+        # Plugin file digests keyed by path -> (mtime_ns, size, sha256)
+        self._hash_cache: Dict[str, Tuple[int, int, str]] = {}
+        self._hash_lock = threading.Lock()
 
         # Preview controller avoids hitting the real SPI device during previews
         self.preview_controller = PreviewLEDController(
@@ -150,20 +215,123 @@ class AnimationManager:
             getattr(self.controller, 'debug', False)
         )
 
-        # Load all plugins on startup
-        self.refresh_plugins()
+        # Layout info shared by every status/frame/preview payload
+        self._led_info: Dict[str, int] = {}
+        self._refresh_led_info()
+
+        # Plugin files as of the last successful refresh_plugins()
+        self._plugins_signature: Optional[frozenset] = None
+
+        # Plugin metadata, built when plugins load and patched per plugin on
+        # save/reload, so the UI's listing never re-instantiates plugins
+        self._plugin_info_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._plugins_list_cache: Optional[List[Dict[str, Any]]] = None
+        # Default-parameter preview payloads per plugin, keyed on
+        # (source mtime_ns, strip_count, leds_per_strip) so edits and layout
+        # changes re-render them
+        self._preview_cache: Dict[str, Tuple[Tuple[Optional[int], int, int], Dict[str, Any]]] = {}
+        # Default-parameter preview instances, reused (after reset()) while the
+        # plugin class and preview dimensions stay the same
+        self._preview_instances: Dict[str, Tuple[Tuple[Any, int, int], AnimationBase]] = {}
+        # Names of loaded plugins, snapshotted whenever the plugin set changes
+        self._known_names: frozenset = frozenset()
+
+        if preload_plugins:
+            # Load all plugins on startup
+            self.refresh_plugins()
+        else:
+            # Only read plugin metadata; get_plugin() imports each one on demand
+            manifest = self.plugin_loader.scan_manifest()
+            self._known_names = self._plugin_names()
+            print(f"✓ Found {len(manifest)} animation plugins (loaded on demand)")
     
-    def refresh_plugins(self) -> Dict[str, Any]:
-        """Reload all animation plugins"""
+    def refresh_plugins(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Reload all animation plugins
+
+        Without ``preload_plugins`` the plugins are only re-registered; each
+        one is re-imported the next time it is used.
+
+        Args:
+            force: Rescan and rebuild plugin metadata even if no plugin file
+                changed since the last refresh (unchanged modules are still
+                not re-executed)
+        """
+        signature = self._plugin_files_signature()
+        if not force and signature is not None and signature == self._plugins_signature:
+            return dict(self._plugin_info_cache)
+
         try:
-            plugins = self.plugin_loader.load_all_plugins()
-            print(f"✓ Loaded {len(plugins)} animation plugins")
-            return {name: self.plugin_loader.get_plugin_info(name) for name in plugins.keys()}
+            plugins = self.plugin_loader.load_all_plugins(lazy=not self.preload_plugins)
+            self._plugins_signature = signature
+            self._invalidate_plugin_caches()
+            if self.preload_plugins:
+                for name in plugins.keys():
+                    self._plugin_info_cache[name] = self.plugin_loader.get_plugin_info(name)
+                self._known_names = frozenset(plugins.keys())
+                print(f"✓ Loaded {len(plugins)} animation plugins")
+            else:
+                self._known_names = self._plugin_names()
+                print(f"✓ Registered {len(self._known_names)} animation plugins (loaded on demand)")
+            return dict(self._plugin_info_cache)
         except Exception as e:
+            self._plugins_signature = None
+            self._invalidate_plugin_caches()
+            self._known_names = self._plugin_names()
             print(f"✗ Error loading plugins: {e}")
             traceback.print_exc()
             return {}
 
+    def _plugin_files_signature(self) -> Optional[frozenset]:
+        """Snapshot (name, mtime_ns, size) of every plugin file to detect changes"""
+        signature = set()
+        try:
+            with os.scandir(self.plugin_loader.plugins_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.py') and entry.is_file():
+                        stat = entry.stat()
+                        signature.add((entry.name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            return None
+        return frozenset(signature)
+
+    def _invalidate_plugin_caches(self):
+        """Drop all cached plugin metadata before a full plugin load"""
+        self._plugin_info_cache = {}
+        self._plugins_list_cache = None
+        self._preview_cache = {}
+        self._preview_instances = {}
+
+    def _update_plugin_info(self, name: str):
+        """Recompute the cached metadata for a single saved or reloaded plugin"""
+        self._plugin_info_cache[name] = self.plugin_loader.get_plugin_info(name)
+        self._plugins_list_cache = None
+        self._preview_cache.pop(name, None)
+        self._preview_instances.pop(name, None)
+        self._known_names = self._plugin_names()
+
+    def _plugin_names(self) -> frozenset:
+        """Names of plugins that can be started: loaded ones, plus every scanned one when loading on demand"""
+        known = frozenset(self.plugin_loader.loaded_plugins.keys())
+        if not self.preload_plugins:
+            known |= frozenset(self.plugin_loader.plugin_files.keys())
+        return known
+
+    def _refresh_led_info(self):
+        """Rebuild the cached layout dict; call if controller dimensions change"""
+        self._led_info = {
+            'total_leds': self.controller.total_leds,
+            'strip_count': self.controller.strip_count,
+            'leds_per_strip': self.controller.leds_per_strip
+        }
+
+    def _resize_frame_buffers(self):
+        """Make sure both frame buffers hold exactly one entry per LED"""
+        total_leds = self.controller.total_leds
+        for buffer in self._frame_buffers:
+            if len(buffer) != total_leds:
+                buffer[:] = black_frame(total_leds)
+
     def _apply_speed_scale(self):
         """Apply global speed scaling to the current animation if supported"""
         if not self.current_animation:
@@ -181,16 +349,23 @@ class AnimationManager:
     
     def list_animations(self) -> List[Dict[str, Any]]:
         """Get list of available animations with metadata"""
-        animations = []
-        for plugin_name in self.plugin_loader.list_plugins():
-            info = self.plugin_loader.get_plugin_info(plugin_name)
-            if info:
-                animations.append(info)
-        return animations
+        if self._plugins_list_cache is None:
+            animations = []
+            for plugin_name in self.plugin_loader.plugin_files:
+                info = self.get_animation_info(plugin_name)
+                if info:
+                    animations.append(info)
+            self._plugins_list_cache = animations
+        return list(self._plugins_list_cache)
     
     def get_animation_info(self, animation_name: str) -> Optional[Dict[str, Any]]:
         """Get detailed info about a specific animation"""
-        return self.plugin_loader.get_plugin_info(animation_name)
+        if animation_name not in self._known_names:
+            return None
+        if animation_name not in self._plugin_info_cache:
+            # Deferred plugins are imported the first time their info is requested
+            self._plugin_info_cache[animation_name] = self.plugin_loader.get_plugin_info(animation_name)
+        return self._plugin_info_cache.get(animation_name)
     
     def start_animation(self, animation_name: str, config: Dict[str, Any] = None) -> bool:
         """
@@ -216,12 +391,17 @@ class AnimationManager:
             # Create animation instance
             self.current_animation = animation_class(self.controller, config or {})
             self.current_animation_name = animation_name
-            self.current_animation_hash = self._compute_animation_hash(animation_name)
+            # Hashing reads the plugin from disk and only feeds status
+            # reporting, so keep it off the start path
+            threading.Thread(
+                target=self._update_animation_hash, args=(animation_name,), daemon=True
+            ).start()
 
             print(f"🔍 Animation instance created: {type(self.current_animation)}")
             print(f"🔍 Is StatefulAnimationBase? {isinstance(self.current_animation, StatefulAnimationBase)}")
 
             self._apply_speed_scale()
+            self._animation_info = self.current_animation.get_info()
 
             # Ensure controller is configured before frames start flowing
             if hasattr(self.controller, "configure"):
@@ -229,14 +409,21 @@ class AnimationManager:
                     self.controller.configure()
                 except Exception as controller_error:
                     print(f"⚠️ Controller configure failed: {controller_error}")
+                # configure() may recompute the controller's dimensions, which
+                # the animation cached when it was built
+                self._refresh_led_info()
+                self._resize_frame_buffers()
+                self.current_animation.refresh_dimensions()
 
             # Start animation
             self.current_animation.start()
             self.is_running = True
             self.stop_event.clear()
             self.frame_count = 0
-            self.frame_timestamps.clear()
-            self.start_time = time.perf_counter()
+            # frame_count restarts, so an encoding cached under an old count is stale
+            self._encoded_frame = None
+            self._reset_fps_tracking()
+            self.start_time_ns = time.perf_counter_ns()
 
             # Check if this is a stateful animation
             if isinstance(self.current_animation, StatefulAnimationBase):
@@ -261,9 +448,10 @@ class AnimationManager:
             self.is_running = False
             self.stop_event.set()
 
-            # Stop frame-based animation thread if it exists
+            # Stop frame-based animation thread if it exists. The loop wakes
+            # on stop_event, so this only waits out an in-flight frame.
             if self.animation_thread and self.animation_thread.is_alive():
-                self.animation_thread.join(timeout=1.0)
+                self.animation_thread.join(timeout=self.STOP_JOIN_TIMEOUT)
             self.animation_thread = None
 
             # Stop the animation (stateful animations handle their own threads)
@@ -273,22 +461,29 @@ class AnimationManager:
                 self.current_animation = None
 
             self.current_animation_name = None
-            self.frame_timestamps.clear()
-            with self.frame_data_lock:
-                self.current_frame_data = []
+            self._animation_info = None
+            self._reset_fps_tracking()
+            self.current_frame_data = []
 
             # Clear LEDs
             self.controller.clear()
 
             print("✓ Animation stopped")
         
-        self.current_animation_hash = None
+        with self._hash_lock:
+            self.current_animation_hash = None
     
     def update_animation_parameters(self, params: Dict[str, Any]) -> bool:
         """Update current animation parameters in real-time"""
         if self.current_animation:
             try:
                 self.current_animation.update_parameters(params)
+                if self._animation_info is not None:
+                    # Publish a new dict so a status payload being serialized never changes
+                    self._animation_info = {
+                        **self._animation_info,
+                        'current_params': dict(self.current_animation.params),
+                    }
                 print(f"✓ Updated animation parameters: {params}")
                 return True
             except Exception as e:
@@ -302,24 +497,22 @@ class AnimationManager:
             'is_running': self.is_running,
             'current_animation': self.current_animation_name,
                 'frame_count': self.frame_count,
-                'uptime': (time.perf_counter() - self.start_time) if self.is_running else 0,
+                'uptime': (time.perf_counter_ns() - self.start_time_ns) / 1e9 if self.is_running else 0,
                 'target_fps': self.target_fps,
                 'animation_speed_scale': self.animation_speed_scale,
                 'actual_fps': self._calculate_fps(),
                 'animation_hash': self.current_animation_hash,
-                'led_info': {
-                    'total_leds': self.controller.total_leds,
-                    'strip_count': self.controller.strip_count,
-                    'leds_per_strip': self.controller.leds_per_strip
-                }
+                'led_info': self._led_info
         }
         
         status['animation_info'] = None
         status['animation_stats'] = {}
-        if self.current_animation:
-            status['animation_info'] = self.current_animation.get_info()
+        animation = self.current_animation
+        if animation:
+            # Fall back to a live lookup while start_animation is still filling the cache
+            status['animation_info'] = self._animation_info or animation.get_info()
             try:
-                stats = self.current_animation.get_runtime_stats()
+                stats = animation.get_runtime_stats()
                 if isinstance(stats, dict):
                     status['animation_stats'] = stats
             except Exception as exc:
@@ -343,48 +536,101 @@ class AnimationManager:
                 print(f"⚠️ Failed to trigger hole: {exc}")
         return False
 
+    def _update_animation_hash(self, animation_name: str):
+        """Compute the plugin hash in the background and publish it if still current"""
+        digest = self._compute_animation_hash(animation_name)
+        with self._hash_lock:
+            if self.current_animation_name == animation_name:
+                self.current_animation_hash = digest
+
     def _compute_animation_hash(self, animation_name: str) -> Optional[str]:
         path = self.plugin_loader.get_plugin_file(animation_name)
         if not path:
             return None
         try:
-            hasher = hashlib.sha256()
+            # Repeated starts of an unchanged plugin reuse the cached digest
+            stat = os.stat(path)
+            cache_key = str(path)
+            cached = self._hash_cache.get(cache_key)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+
             with open(path, 'rb') as fh:
-                for chunk in iter(lambda: fh.read(8192), b''):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+                if hasattr(hashlib, 'file_digest'):
+                    digest = hashlib.file_digest(fh, 'sha256').hexdigest()
+                else:
+                    hasher = hashlib.sha256()
+                    for chunk in iter(lambda: fh.read(65536), b''):
+                        hasher.update(chunk)
+                    digest = hasher.hexdigest()
+
+            self._hash_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, digest)
+            return digest
         except OSError as exc:
             print(f"⚠️ Failed to hash animation file {path}: {exc}")
             return None
 
     def get_current_frame(self) -> Dict[str, Any]:
-        """Get current animation frame data for web rendering"""
-        with self.frame_data_lock:
-            frame_data = list(self.current_frame_data)
+        """
+        Get current animation frame data for web rendering
 
-        encoded_frame = encode_frame_data(frame_data)
+        The loop publishes frames by pointing ``current_frame_data`` at one of
+        its two preallocated buffers, so the hot path never copies or locks.
+        The single copy happens here, only when a client actually asks, and
+        only if a new frame was published since the previous request.
+        """
+        # Read the count before the buffer: the loop publishes first and then
+        # counts, and can only reuse a buffer after counting, so an unchanged
+        # (buffer, count) pair means unchanged contents
+        frame_count = self.frame_count
+        source = self.current_frame_data
+        cached = self._encoded_frame
+        if cached is not None and cached[0] is source and cached[1] == frame_count:
+            encoded_frame, frame_length = cached[2], cached[3]
+        else:
+            # Snapshot the published front buffer; the loop only writes the back one.
+            # Packed frames are immutable snapshots and are split into tuples here
+            if isinstance(source, PACKED_FRAME_TYPES):
+                frame_data = unpack_frame_rgb(source)
+            else:
+                frame_data = list(source)
+            encoded_frame = encode_frame_data(frame_data)
+            frame_length = len(frame_data)
+            self._encoded_frame = (source, frame_count, encoded_frame, frame_length)
 
         return {
             'frame_data_encoded': encoded_frame,
-            'frame_data_length': len(frame_data),
+            'frame_data_length': frame_length,
             'frame_encoding': FRAME_ENCODING_NAME if encoded_frame else None,
-            'led_info': {
-                'total_leds': self.controller.total_leds,
-                'strip_count': self.controller.strip_count,
-                'leds_per_strip': self.controller.leds_per_strip
-            },
+            'led_info': self._led_info,
             'is_running': self.is_running,
-            'frame_count': self.frame_count,
+            'frame_count': frame_count,
             'current_animation': self.current_animation_name if self.is_running else None,
             'timestamp': time.time()
         }
 
+    def _preview_class(self, animation_name: str):
+        """Resolve a plugin class for a preview, rejecting unknown names up front"""
+        animation_class = None
+        if animation_name in self._known_names:
+            animation_class = self.plugin_loader.get_plugin(animation_name)
+        if animation_class is None:
+            raise ValueError(f"Animation '{animation_name}' not found")
+        return animation_class
+
     def get_animation_preview(self, animation_name: str) -> Dict[str, Any]:
         """Get a preview frame from a specific animation without starting it"""
-        if animation_name not in self.plugin_loader.loaded_plugins:
-            raise ValueError(f"Animation '{animation_name}' not found")
+        animation_class = self._preview_class(animation_name)
 
-        animation_class = self.plugin_loader.loaded_plugins[animation_name]
+        # Default previews only change when the plugin source or layout does
+        cache_key = (
+            self.plugin_loader.get_plugin_source_mtime(animation_name),
+            self.controller.strip_count,
+            self.controller.leds_per_strip,
+        )
+        cached = self._preview_cache.get(animation_name)
+        if cached is not None and cached[0] == cache_key:
+            return {**cached[1], 'timestamp': time.time()}
 
         # Keep preview controller dimensions in sync with the real controller
         self.preview_controller.strip_count = self.controller.strip_count
@@ -392,52 +638,56 @@ class AnimationManager:
         self.preview_controller.total_leds = self.controller.total_leds
 
         try:
-            # Create a temporary instance of the animation
-            temp_animation = animation_class(self.preview_controller, {})
+            # Reuse this plugin's preview instance, rewound to its initial state;
+            # overriding reset() is how a plugin opts in (see AnimationBase.reset),
+            # the rest get a fresh instance per preview
+            reusable = animation_class.reset is not AnimationBase.reset
+            instance_key = (animation_class, self.controller.strip_count, self.controller.leds_per_strip)
+            instance = self._preview_instances.get(animation_name) if reusable else None
+            if instance is not None and instance[0] == instance_key:
+                temp_animation = instance[1]
+                temp_animation.reset()
+            else:
+                temp_animation = animation_class(self.preview_controller, {})
+                if reusable:
+                    self._preview_instances[animation_name] = (instance_key, temp_animation)
 
             # Generate a sample frame
             if hasattr(temp_animation, 'generate_frame'):
                 # For frame-based animations
                 frame_data = temp_animation.generate_frame(time_elapsed=0.0, frame_count=0)
-                if frame_data is None:
-                    frame_data = [(0, 0, 0)] * self.controller.total_leds
             else:
                 # For step-based animations, run a few steps
                 temp_animation.reset()
                 for _ in range(5):  # Run a few steps to get interesting output
                     temp_animation.step()
 
-                # Get the current state
-                frame_data = [(0, 0, 0)] * self.controller.total_leds
+                # Get the current state (None normalizes to a black frame)
+                frame_data = None
                 if hasattr(temp_animation, 'get_current_colors'):
                     frame_data = temp_animation.get_current_colors()
 
-            frame_data = self._normalize_frame(frame_data)
+            # Copy: the reused instance may hand back its own frame buffer
+            frame_data = list(self._normalize_frame(frame_data))
 
-            return {
+            preview = {
                 'frame_data': frame_data,
-                'led_info': {
-                    'total_leds': self.controller.total_leds,
-                    'strip_count': self.controller.strip_count,
-                    'leds_per_strip': self.controller.leds_per_strip
-                },
+                'led_info': self._led_info,
                 'is_running': False,
                 'frame_count': 0,
                 'current_animation': animation_name,
                 'timestamp': time.time(),
                 'preview': True
             }
+            self._preview_cache[animation_name] = (cache_key, preview)
+            return preview
 
         except Exception as e:
             print(f"Error generating preview for {animation_name}: {e}")
             # Return a default pattern
             return {
                 'frame_data': [(50, 50, 50)] * self.controller.total_leds,  # Dim gray
-                'led_info': {
-                    'total_leds': self.controller.total_leds,
-                    'strip_count': self.controller.strip_count,
-                    'leds_per_strip': self.controller.leds_per_strip
-                },
+                'led_info': self._led_info,
                 'is_running': False,
                 'frame_count': 0,
                 'current_animation': animation_name,
@@ -448,10 +698,7 @@ class AnimationManager:
 
     def get_animation_preview_with_params(self, animation_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Get a preview frame from a specific animation with custom parameters"""
-        if animation_name not in self.plugin_loader.loaded_plugins:
-            raise ValueError(f"Animation '{animation_name}' not found")
-
-        animation_class = self.plugin_loader.loaded_plugins[animation_name]
+        animation_class = self._preview_class(animation_name)
 
         # Keep preview controller dimensions in sync with the real controller
         self.preview_controller.strip_count = self.controller.strip_count
@@ -466,16 +713,14 @@ class AnimationManager:
             if hasattr(temp_animation, 'generate_frame'):
                 # For frame-based animations
                 frame_data = temp_animation.generate_frame(time_elapsed=0.0, frame_count=0)
-                if frame_data is None:
-                    frame_data = [(0, 0, 0)] * self.controller.total_leds
             else:
                 # For step-based animations, run a few steps
                 temp_animation.reset()
                 for _ in range(5):  # Run a few steps to get interesting output
                     temp_animation.step()
 
-                # Get the current state
-                frame_data = [(0, 0, 0)] * self.controller.total_leds
+                # Get the current state (None normalizes to a black frame)
+                frame_data = None
                 if hasattr(temp_animation, 'get_current_colors'):
                     frame_data = temp_animation.get_current_colors()
 
@@ -483,11 +728,7 @@ class AnimationManager:
 
             return {
                 'frame_data': frame_data,
-                'led_info': {
-                    'total_leds': self.controller.total_leds,
-                    'strip_count': self.controller.strip_count,
-                    'leds_per_strip': self.controller.leds_per_strip
-                },
+                'led_info': self._led_info,
                 'is_running': False,
                 'frame_count': 0,
                 'current_animation': animation_name,
@@ -501,11 +742,7 @@ class AnimationManager:
             # Return a default pattern
             return {
                 'frame_data': [(50, 50, 50)] * self.controller.total_leds,  # Dim gray
-                'led_info': {
-                    'total_leds': self.controller.total_leds,
-                    'strip_count': self.controller.strip_count,
-                    'leds_per_strip': self.controller.leds_per_strip
-                },
+                'led_info': self._led_info,
                 'is_running': False,
                 'frame_count': 0,
                 'current_animation': animation_name,
@@ -516,142 +753,302 @@ class AnimationManager:
             }
 
     def _animation_loop(self):
-        """Main animation loop running in separate thread"""
-        target_frame_time = 1.0 / max(1, int(self.target_fps) or 1)
-
-        while self.is_running and not self.stop_event.is_set():
-            loop_start = time.perf_counter()
-            generate_duration = 0.0
-            send_duration = 0.0
-            show_duration = 0.0
-            inline_show = getattr(self.controller, "inline_show", False)
+        """
+        Main animation loop running in separate thread
+
+        Each run is specialized up front: the animation and controller are
+        fixed for the lifetime of the thread, so their bound methods and
+        capability checks are resolved once before the first frame and the
+        per-frame path only calls locals.
+
+        This stays a plain thread rather than an asyncio task: the controller
+        process has no event loop (it polls the file control channel) and the
+        Flask UI runs in a separate process, so there is nothing to share a
+        loop with. Frame kernels are pure Python and would block an event
+        loop just as long as they hold the GIL here.
+        """
+        animation = self.current_animation
+        if animation is None:
+            return
+        render = animation.generate_frame_into
+        # Animations that render packed frames themselves go straight to the
+        # controller's byte path, skipping the tuple list and its packing
+        send_bytes = getattr(self.controller, "set_all_pixels_bytes", None)
+        render_bytes = None
+        if send_bytes is not None and (
+            type(animation).generate_frame_bytes is not AnimationBase.generate_frame_bytes
+        ):
+            render_bytes = animation.generate_frame_bytes
+        self._apply_thread_scheduling()
+
+        # All timing is integer nanoseconds; convert only at the edges
+        clock = time.perf_counter_ns
+        start_ns = self.start_time_ns
+        # target_fps may be changed mid-run; the frame period is recomputed
+        # only when it does
+        target_fps = self.target_fps
+        target_frame_ns = self._frame_period_ns(target_fps)
+        spin_wait = self._should_spin_wait(target_fps)
+        spin_window_ns = self.SPIN_WINDOW_NS
+        # Absolute deadline for the end of the current frame. Sleeping to a
+        # deadline (rather than for "frame time minus work") keeps sleep
+        # overshoot from accumulating into FPS drift.
+        next_deadline = clock() + target_frame_ns
+        # Buffers are resized in place, so the pair itself is stable per run
+        frame_buffers = self._frame_buffers
+        back_index = 0
+        # Timing samples are handed to the perf ring in batches
+        pending_samples: List[Tuple[int, ...]] = []
+        record_samples = self._record_perf_samples
+        batch_size = self.PERF_BATCH_SIZE
+        update_fps = self._update_fps_tracking
+
+        # Resolve controller capabilities once instead of on every frame
+        set_all_pixels = send_bytes if render_bytes is not None else self.controller.set_all_pixels
+        inline_show = getattr(self.controller, "inline_show", False)
+        show = None if inline_show else getattr(self.controller, "show", None)
+        # stop_animation always sets the event alongside clearing is_running
+        stop_requested = self.stop_event.is_set
+        # Waiting on the stop event instead of sleeping lets stop_animation
+        # interrupt the pause between frames immediately
+        wait_for_stop = self.stop_event.wait
+        # A broken animation fails every frame; print each distinct error (and
+        # its traceback) once and just count the repeats
+        last_error = None
+        repeated_errors = 0
+
+        while not stop_requested():
+            loop_start = clock()
+            if self.target_fps != target_fps:
+                target_fps = self.target_fps
+                target_frame_ns = self._frame_period_ns(target_fps)
+                spin_wait = self._should_spin_wait(target_fps)
+                next_deadline = loop_start + target_frame_ns
+            generate_duration = 0
+            send_duration = 0
+            show_duration = 0
 
             try:
-                if not self.current_animation:
+                # A newer run (or stop) replaced our animation; let it take over
+                if self.current_animation is not animation:
                     break
 
-                # Generate frame
-                time_elapsed = loop_start - self.start_time
-                gen_start = time.perf_counter()
-                colors = self.current_animation.generate_frame(time_elapsed, self.frame_count)
-                frame = self._normalize_frame(colors)
-                generate_duration = time.perf_counter() - gen_start
-
-                # Store frame data for web interface
-                with self.frame_data_lock:
-                    self.current_frame_data = frame
+                # Render straight into the back buffer, then publish it for the
+                # web interface
+                frame_count = self.frame_count
+                time_elapsed = (loop_start - start_ns) * 1e-9
+                if render_bytes is not None:
+                    # The animation refills its byte buffer next frame, so
+                    # publish and send an immutable copy
+                    frame = bytes(render_bytes(time_elapsed, frame_count))
+                else:
+                    frame = frame_buffers[back_index]
+                    render(time_elapsed, frame_count, frame)
+                    back_index ^= 1
+                self.current_frame_data = frame
+                send_start = clock()
+                generate_duration = send_start - loop_start
 
                 # Send to LEDs
-                send_start = time.perf_counter()
-                self.controller.set_all_pixels(frame)
-                send_duration = time.perf_counter() - send_start
+                set_all_pixels(frame)
+                show_start = clock()
+                send_duration = show_start - send_start
 
                 # Some controllers need an explicit show; skip if controller handles it internally
-                if not inline_show and hasattr(self.controller, "show"):
+                if show is not None:
                     try:
-                        show_start = time.perf_counter()
-                        self.controller.show()
-                        show_duration = time.perf_counter() - show_start
+                        show()
+                        show_duration = clock() - show_start
                     except Exception:
                         # Controllers that embed show inside set_all_pixels will ignore this
                         pass
 
-                self.frame_count += 1
+                self.frame_count = frame_count + 1
 
                 # Update FPS tracking
-                self._update_fps_tracking(loop_start)
+                update_fps(loop_start)
 
             except Exception as e:
-                print(f"✗ Animation loop error: {e}")
-                traceback.print_exc()
-                time.sleep(0.05)
-
-            # Sleep to maintain target FPS
-            loop_duration = time.perf_counter() - loop_start
-            sleep_time = max(0.0, target_frame_time - loop_duration)
+                error = (type(e), str(e))
+                if error != last_error:
+                    if repeated_errors:
+                        print(f"   (previous animation loop error repeated {repeated_errors} more times)")
+                    print(f"✗ Animation loop error: {e}")
+                    traceback.print_exc()
+                    last_error = error
+                    repeated_errors = 0
+                else:
+                    repeated_errors += 1
+                wait_for_stop(0.05)
+
+            # Wait until this frame's deadline to maintain target FPS; a stop
+            # request ends the wait and the loop condition exits
+            now = clock()
+            loop_duration = now - loop_start
+            sleep_time = max(0, next_deadline - now)
             if sleep_time > 0:
-                time.sleep(sleep_time)
-
-            self._record_perf_sample({
-                'generate': generate_duration,
-                'send': send_duration,
-                'show': show_duration,
-                'process': loop_duration,
-                'sleep': sleep_time,
-                'frame': loop_duration + sleep_time,
-            })
-
-    def _normalize_frame(self, colors: Optional[List[Any]]) -> List[Any]:
-        """Ensure frame length matches the LED count and is always a list"""
-        total_pixels = self.controller.total_leds
+                if spin_wait:
+                    # Coarse wait, then spin through the last stretch
+                    if sleep_time > spin_window_ns:
+                        wait_for_stop((sleep_time - spin_window_ns) * 1e-9)
+                    while clock() < next_deadline and not stop_requested():
+                        pass
+                else:
+                    wait_for_stop(sleep_time * 1e-9)
+
+            next_deadline += target_frame_ns
+            if now > next_deadline:
+                # More than a frame behind: resync instead of bursting frames
+                next_deadline = now + target_frame_ns
+
+            pending_samples.append((
+                generate_duration,
+                send_duration,
+                show_duration,
+                loop_duration,
+                sleep_time,
+                loop_duration + sleep_time,
+            ))
+            if len(pending_samples) >= batch_size:
+                record_samples(pending_samples)
+                pending_samples = []
+
+        if pending_samples:
+            record_samples(pending_samples)
+        if repeated_errors:
+            print(f"   (previous animation loop error repeated {repeated_errors} more times)")
+
+    @staticmethod
+    def _frame_period_ns(target_fps) -> int:
+        """Integer frame period in nanoseconds for a (possibly unset) target FPS"""
+        return 1_000_000_000 // max(1, int(target_fps or 1))
+
+    @classmethod
+    def _should_spin_wait(cls, target_fps) -> bool:
+        """Whether the frame pacing should busy-wait the tail of each frame"""
+        return (target_fps or 0) >= cls.SPIN_FPS_THRESHOLD
+
+    def _apply_thread_scheduling(self):
+        """Pin and/or prioritize the calling (animation) thread as configured"""
+        # On Linux, pid 0 addresses the calling thread rather than the process
+        if self.cpu_pin is not None and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, {self.cpu_pin})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not pin animation thread to CPU {self.cpu_pin}: {e}")
 
-        if colors is None:
-            return [(0, 0, 0)] * total_pixels
+        if self.realtime_priority > 0 and hasattr(os, "sched_setscheduler"):
+            try:
+                os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(self.realtime_priority))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not set realtime priority {self.realtime_priority}: {e}")
 
-        frame = list(colors)
+    def _normalize_frame(self, colors: Optional[List[Any]],
+                         out: Optional[List[Any]] = None) -> List[Any]:
+        """
+        Ensure frame length matches the LED count and is always a list
 
-        if len(frame) < total_pixels:
-            frame.extend([(0, 0, 0)] * (total_pixels - len(frame)))
-        elif len(frame) > total_pixels:
-            frame = frame[:total_pixels]
+        Args:
+            colors: Frame returned by the animation (RGB tuples or packed RGB bytes)
+            out: Optional preallocated buffer to copy into instead of building
+                a new list; resized if the LED count changed
 
-        return frame
+        Returns:
+            The normalized frame (``out`` when provided)
+        """
+        total_pixels = self.controller.total_leds
+        if out is None:
+            # A correctly sized list can be used as-is; only copy to fix it up
+            if type(colors) is list and len(colors) == total_pixels:
+                return colors
+            out = list(black_frame(total_pixels))
+        return normalize_into(colors, out, total_pixels)
     
-    def _update_fps_tracking(self, timestamp: Optional[float] = None):
-        """Record frame timestamps for FPS calculation"""
-        now = timestamp if timestamp is not None else time.perf_counter()
-        self.frame_timestamps.append(now)
-
-        # Keep only a small window of timestamps to reflect current performance
-        while self.frame_timestamps and (now - self.frame_timestamps[0]) > 5.0:
-            self.frame_timestamps.popleft()
+    def _reset_fps_tracking(self):
+        """Forget FPS measurements from a previous run"""
+        self._fps_window_start = None
+        self._fps_last_frame = 0
+        self._fps_window_frames = 0
+        self._fps_history.clear()
+        self._fps_sum = 0.0
+
+    def _update_fps_tracking(self, timestamp_ns: Optional[int] = None):
+        """Count a rendered frame (perf_counter_ns timestamp) toward the FPS window"""
+        now = timestamp_ns if timestamp_ns is not None else time.perf_counter_ns()
+        self._fps_last_frame = now
+        if self._fps_window_start is None:
+            self._fps_window_start = now
+            return
+
+        self._fps_window_frames += 1
+        elapsed = now - self._fps_window_start
+        if elapsed >= self.FPS_WINDOW_NS:
+            window_fps = self._fps_window_frames * 1e9 / elapsed
+            history = self._fps_history
+            if len(history) == history.maxlen:
+                self._fps_sum -= history[0]
+            history.append(window_fps)
+            self._fps_sum += window_fps
+            self._fps_window_start = now
+            self._fps_window_frames = 0
     
     def _calculate_fps(self) -> float:
-        """Calculate current FPS"""
-        if len(self.frame_timestamps) < 2:
+        """Current FPS: mean of the recent completed windows, or the partial first one"""
+        if self._fps_history:
+            return self._fps_sum / len(self._fps_history)
+        if self._fps_window_start is None or not self._fps_window_frames:
             return 0.0
-        duration = self.frame_timestamps[-1] - self.frame_timestamps[0]
-        if duration <= 0:
-            return 0.0
-        return (len(self.frame_timestamps) - 1) / duration
-
-    def _record_perf_sample(self, sample: Dict[str, float]):
-        """Store per-frame timing samples for debugging"""
-        with self.perf_lock:
-            self.perf_samples.append(sample)
-            self._last_perf_sample = sample
+        elapsed = self._fps_last_frame - self._fps_window_start
+        return self._fps_window_frames * 1e9 / elapsed if elapsed > 0 else 0.0
+
+    def _record_perf_samples(self, samples: List[Tuple[int, ...]]):
+        """Store a batch of per-frame timing samples (ns, ordered as PERF_KEYS)"""
+        ring = self._perf_ring
+        size = self.PERF_RING_SIZE
+        head = self._perf_head
+        for sample in samples:
+            ring[head] = sample
+            head = (head + 1) % size
+        self._perf_head = head
+        self._perf_count = min(size, self._perf_count + len(samples))
 
     def _get_perf_summary(self) -> Dict[str, Any]:
         """Summarize recent performance metrics"""
-        with self.perf_lock:
-            if not self.perf_samples:
-                return {}
-
-            count = len(self.perf_samples)
-            totals = {key: 0.0 for key in ('generate', 'send', 'show', 'process', 'sleep', 'frame')}
-            for sample in self.perf_samples:
-                for key in totals.keys():
-                    totals[key] += sample.get(key, 0.0)
-
-            target_frame_ms = 1000.0 / max(1, float(self.target_fps or 1))
-            summary = {
-                'samples': count,
-                'target_frame_ms': target_frame_ms,
-                'controller_inline_show': bool(getattr(self.controller, "inline_show", False)),
-            }
+        # Read the indices before copying the ring; a sample written meanwhile
+        # only replaces the oldest entry, so the snapshot stays consistent.
+        count = self._perf_count
+        head = self._perf_head
+        ring = list(self._perf_ring)
+        if not count:
+            return {}
+
+        samples = ring[:count] if count < self.PERF_RING_SIZE else ring
+        last_sample = ring[head - 1]
+
+        # Transpose into per-field columns and let the C builtins do the sums
+        totals = [sum(column) for column in zip(*samples)]
+
+        target_frame_ms = 1000.0 / max(1, float(self.target_fps or 1))
+        summary = {
+            'samples': len(samples),
+            'target_frame_ms': target_frame_ms,
+            'controller_inline_show': bool(getattr(self.controller, "inline_show", False)),
+        }
 
-            for key, total in totals.items():
-                summary[f'avg_{key}_ms'] = (total / count) * 1000.0
+        for key, total in zip(self.PERF_KEYS, totals):
+            summary[f'avg_{key}_ms'] = (total / len(samples)) * 1e-6
 
-            if self._last_perf_sample:
-                for key in totals.keys():
-                    summary[f'last_{key}_ms'] = self._last_perf_sample.get(key, 0.0) * 1000.0
+        for key, value in zip(self.PERF_KEYS, last_sample):
+            summary[f'last_{key}_ms'] = value * 1e-6
 
-            return summary
+        return summary
     
     def save_animation(self, name: str, code: str) -> bool:
         """Save new animation plugin"""
-        return self.plugin_loader.save_plugin(name, code)
+        saved = self.plugin_loader.save_plugin(name, code)
+        if saved:
+            self._update_plugin_info(name)
+        return saved
     
     def reload_animation(self, name: str) -> bool:
         """Reload specific animation plugin"""
@@ -661,3 +1058,5 @@ class AnimationManager:
         except Exception as e:
             print(f"✗ Failed to reload animation {name}: {e}")
             return False
+        finally:
+            self._update_plugin_info(name)
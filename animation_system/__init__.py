@@ -5,8 +5,9 @@ LED Grid Animation System
 A plugin-based animation system for LED grids with hot-swapping capabilities.
 """
 
-from .animation_base import AnimationBase, StatefulAnimationBase
+from .animation_base import AnimationBase, StatefulAnimationBase, black_frame, mix_linear, normalize_into
 from .plugin_loader import AnimationPluginLoader
 
 __version__ = "1.0.0"
-__all__ = ["AnimationBase", "StatefulAnimationBase", "AnimationPluginLoader"]
+__all__ = ["AnimationBase", "StatefulAnimationBase", "AnimationPluginLoader",
+           "black_frame", "mix_linear", "normalize_into"]
@@ -4,10 +4,232 @@ Base animation class and plugin system for LED Grid
 """
 
 import time
-import colorsys
 import threading
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict, Any, Optional
+from array import array
+from bisect import bisect
+from functools import lru_cache
+from itertools import chain, starmap
+from types import MappingProxyType
+from typing import List, Tuple, Dict, Any, Iterable, Mapping, Optional, Sequence
+
+from frame_data_codec import (
+    PACKED_FRAME_TYPES, U32_TYPECODE, frame_to_u32, pack_frame_rgb, pack_frame_u32, unpack_frame_rgb
+)
+
+
+@lru_cache(maxsize=8)
+def black_frame(total_pixels: int) -> Tuple[Tuple[int, int, int], ...]:
+    """Shared immutable all-black frame; slice-assigning it into a list copies nothing extra"""
+    return ((0, 0, 0),) * total_pixels
+
+
+def normalize_into(colors: Optional[Any], out: List[Any], total_pixels: int) -> List[Any]:
+    """
+    Copy an animation frame into ``out``, padding with black or truncating so
+    it holds exactly ``total_pixels`` entries.
+
+    Only C-level slice operations touch the pixels, so the cost stays flat no
+    matter how the frame was produced. Channel values are passed through as-is;
+    the SPI controllers mask each channel to a byte when packing. Packed
+    R, G, B byte frames and uint32 pixel arrays are split into tuples first.
+    """
+    if colors is None or len(out) != total_pixels:
+        out[:] = black_frame(total_pixels)
+        if colors is None:
+            return out
+
+    if isinstance(colors, array):
+        colors = unpack_frame_rgb(pack_frame_u32(colors, len(colors)))
+    elif isinstance(colors, PACKED_FRAME_TYPES):
+        colors = unpack_frame_rgb(colors)
+
+    if not isinstance(colors, (list, tuple)):
+        colors = list(colors)
+
+    if len(colors) == total_pixels:
+        # Common case: copy straight across without an intermediate slice
+        out[:] = colors
+        return out
+
+    count = min(len(colors), total_pixels)
+    out[:count] = colors[:count]
+    if count < total_pixels:
+        out[count:] = black_frame(total_pixels - count)
+
+    return out
+
+
+# Perceptual correction for compose_frame(gamma=True): LED output is linear,
+# so without it low channel values look far brighter than intended
+GAMMA = 2.2
+GAMMA_LUT: Tuple[int, ...] = tuple(int(round(((i / 255.0) ** GAMMA) * 255)) for i in range(256))
+
+# Channel values are gamma encoded, so blending them directly darkens the
+# midpoint of every fade. mix_linear decodes to linear light with this table,
+# blends, and encodes back to the nearest channel value by bisecting the
+# midpoints between neighbouring table entries.
+SRGB_TO_LINEAR: Tuple[float, ...] = tuple((i / 255.0) ** GAMMA for i in range(256))
+_LINEAR_MIDPOINTS: Tuple[float, ...] = tuple(
+    (SRGB_TO_LINEAR[i] + SRGB_TO_LINEAR[i + 1]) / 2 for i in range(255)
+)
+
+
+def mix_linear(base: Tuple[int, int, int], overlay: Tuple[int, int, int], mix: float) -> Tuple[int, int, int]:
+    """
+    Blend two 0-255 colors in linear light; ``mix`` 0 gives ``base`` and 1 gives ``overlay``
+
+    Channels are clamped to 0-255 first. The endpoints come back unchanged.
+    """
+    to_linear = SRGB_TO_LINEAR
+    midpoints = _LINEAR_MIDPOINTS
+    r0, g0, b0 = [to_linear[max(0, min(255, int(c)))] for c in base]
+    r1, g1, b1 = [to_linear[max(0, min(255, int(c)))] for c in overlay]
+    return (
+        bisect(midpoints, r0 + (r1 - r0) * mix),
+        bisect(midpoints, g0 + (g1 - g0) * mix),
+        bisect(midpoints, b0 + (b1 - b0) * mix),
+    )
+
+
+@lru_cache(maxsize=32)
+def channel_lut(brightness: float, gamma: bool = False) -> Tuple[int, ...]:
+    """256-entry table mapping a 0-255 channel to its brightness (and gamma) adjusted value"""
+    scale = brightness_q8(brightness)
+    if gamma:
+        return tuple(GAMMA_LUT[min(255, (i * scale) >> 8)] for i in range(256))
+    return tuple((i * scale) >> 8 for i in range(256))
+
+
+@lru_cache(maxsize=32)
+def channel_table(brightness: float, gamma: bool = False) -> bytes:
+    """``channel_lut`` as a bytes translation table, for scaling packed frames with ``bytes.translate``"""
+    return bytes(min(255, c) for c in channel_lut(brightness, gamma))
+
+
+def brightness_q8(brightness: float) -> int:
+    """Brightness as Q8 fixed point (256 == 1.0) so channels scale with ``(c * q8) >> 8``"""
+    return int(round(brightness * 256))
+
+
+def hsv_to_rgb255(h: float, s: float, v: float) -> Tuple[int, int, int]:
+    """
+    HSV (0-1) to integer RGB (0-255), identical to scaling colorsys.hsv_to_rgb
+
+    colorsys' six-sector formula is inlined so each call is one function
+    frame with the 0-255 truncation folded in, instead of a colorsys call plus
+    three float multiplies and a tuple unpack.
+    """
+    if s == 0.0:
+        c = int(v * 255)
+        return c, c, c
+    h6 = h * 6.0
+    i = int(h6)
+    f = h6 - i
+    p = int(v * (1.0 - s) * 255)
+    i %= 6
+    if i == 0:
+        return int(v * 255), int(v * (1.0 - s * (1.0 - f)) * 255), p
+    if i == 1:
+        return int(v * (1.0 - s * f) * 255), int(v * 255), p
+    if i == 2:
+        return p, int(v * 255), int(v * (1.0 - s * (1.0 - f)) * 255)
+    if i == 3:
+        return p, int(v * (1.0 - s * f) * 255), int(v * 255)
+    if i == 4:
+        return int(v * (1.0 - s * (1.0 - f)) * 255), p, int(v * 255)
+    return int(v * 255), p, int(v * (1.0 - s * f) * 255)
+
+
+# Fully saturated, full-value colors for 256 evenly spaced hues; index with
+# int(h * 256) & 255, which also wraps hues outside [0, 1)
+HUE_LUT: Tuple[Tuple[int, int, int], ...] = tuple(hsv_to_rgb255(i / 256, 1.0, 1.0) for i in range(256))
+
+
+# Identity channel table, for HSV runs that need plain 0-255 output
+_IDENTITY_LUT: Tuple[int, ...] = tuple(range(256))
+
+
+def _hsv_run(hues: Sequence[float], s: float, v: float,
+             lut: Tuple[int, ...] = _IDENTITY_LUT) -> List[Tuple[int, int, int]]:
+    """
+    colorsys.hsv_to_rgb for a run of hues, scaled to 0-255 and mapped through ``lut``
+
+    The per-sector arithmetic is ``hsv_to_rgb255``'s, repeated inline rather
+    than called so a run pays no function call per pixel, and with the
+    saturation/value terms worked out once. Hues wrap into [0, 1) and
+    saturation/value clamp to [0, 1] so every channel lands inside the table.
+    """
+    if not 0.0 <= s <= 1.0:
+        s = 0.0 if s < 0.0 else 1.0
+    if not 0.0 <= v <= 1.0:
+        v = 0.0 if v < 0.0 else 1.0
+    v255 = lut[int(v * 255)]
+    if s == 0.0:
+        return [(v255, v255, v255)] * len(hues)
+
+    p255 = lut[int(v * (1.0 - s) * 255)]
+    colors = []
+    append = colors.append
+    for h in hues:
+        h6 = (h % 1.0) * 6.0
+        i = int(h6)
+        f = h6 - i
+        i %= 6
+        if i == 0:
+            append((v255, lut[int(v * (1.0 - s * (1.0 - f)) * 255)], p255))
+        elif i == 1:
+            append((lut[int(v * (1.0 - s * f) * 255)], v255, p255))
+        elif i == 2:
+            append((p255, v255, lut[int(v * (1.0 - s * (1.0 - f)) * 255)]))
+        elif i == 3:
+            append((p255, lut[int(v * (1.0 - s * f) * 255)], v255))
+        elif i == 4:
+            append((lut[int(v * (1.0 - s * (1.0 - f)) * 255)], p255, v255))
+        else:
+            append((v255, p255, lut[int(v * (1.0 - s * f) * 255)]))
+    return colors
+
+
+# Parameters every animation accepts. Built once at import; get_parameter_schema()
+# hands out shallow copies so subclasses can add their own entries.
+_DEFAULT_PARAM_SCHEMA: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    'speed': {
+        'type': 'float',
+        'min': 0.1,
+        'max': 5.0,
+        'default': 1.0,
+        'description': 'Animation speed multiplier'
+    },
+    'brightness': {
+        'type': 'float',
+        'min': 0.0,
+        'max': 1.0,
+        'default': 1.0,
+        'description': 'Overall brightness (0.0 - 1.0)'
+    },
+    'color_saturation': {
+        'type': 'float',
+        'min': 0.0,
+        'max': 1.0,
+        'default': 1.0,
+        'description': 'Color saturation (0.0 - 1.0)'
+    },
+    'color_value': {
+        'type': 'float',
+        'min': 0.0,
+        'max': 1.0,
+        'default': 1.0,
+        'description': 'Color value/brightness (0.0 - 1.0)'
+    }
+})
+
+_DEFAULT_PARAMS: Mapping[str, Any] = MappingProxyType({
+    'speed': 1.0,
+    'brightness': 1.0,
+    'color_saturation': 1.0,
+    'color_value': 1.0
+})
 
 
 class AnimationBase(ABC):
@@ -23,25 +245,30 @@ class AnimationBase(ABC):
         """
         self.controller = controller
         self.config = config or {}
+        # Layout snapshot read once, so hot paths don't go through the controller
+        self.refresh_dimensions()
         self.start_time = time.time()
         self.frame_count = 0
         self.is_running = False
+
+        # Reusable frame storage, see get_frame_buffer() and get_byte_buffer()
+        self.frame_buf: List[Tuple[int, int, int]] = []
+        self.byte_buf = bytearray()
+        self.u32_buf = array(U32_TYPECODE)
         
         # Animation metadata
         self.name = getattr(self, 'ANIMATION_NAME', self.__class__.__name__)
         self.description = getattr(self, 'ANIMATION_DESCRIPTION', 'No description')
         self.author = getattr(self, 'ANIMATION_AUTHOR', 'Unknown')
         self.version = getattr(self, 'ANIMATION_VERSION', '1.0')
+        # Invariant part of get_info(), built on first use
+        self._info_static: Optional[Dict[str, Any]] = None
         
         # Default parameters that can be overridden
-        self.default_params = {
-            'speed': 1.0,
-            'brightness': 1.0,
-            'color_saturation': 1.0,
-            'color_value': 1.0
-        }
+        self.default_params = dict(_DEFAULT_PARAMS)
         
-        # Merge default params with config
+        # Merge default params with config; assigning runs the setter, so the
+        # mirrored hot values see the configured brightness/speed
         self.params = {**self.default_params, **self.config}
     
     @abstractmethod
@@ -54,9 +281,38 @@ class AnimationBase(ABC):
             frame_count: Number of frames rendered so far
             
         Returns:
-            List of (r, g, b) tuples for all pixels
+            List of (r, g, b) tuples for all pixels, or the same frame packed
+            as flat R, G, B bytes (see ``get_byte_buffer``) or as 0x00RRGGBB
+            words (see ``get_u32_buffer``)
         """
         pass
+
+    def generate_frame_into(self, time_elapsed: float, frame_count: int,
+                            out: List[Tuple[int, int, int]]) -> None:
+        """
+        Render a frame directly into a caller-owned buffer
+
+        The animation loop reuses the same buffers every frame, so animations
+        that override this and assign ``out[i] = (r, g, b)`` for every pixel
+        skip building an intermediate list. The default implementation wraps
+        ``generate_frame`` so existing animations keep working unchanged.
+
+        Args:
+            time_elapsed: Time since animation started (seconds)
+            frame_count: Number of frames rendered so far
+            out: List with exactly one entry per pixel; every entry must be written
+        """
+        normalize_into(self.generate_frame(time_elapsed, frame_count), out, len(out))
+    
+    def generate_frame_bytes(self, time_elapsed: float, frame_count: int) -> bytearray:
+        """
+        Generate a frame already packed for transport (3 bytes per pixel, R G B)
+
+        Controllers expose ``set_all_pixels_bytes`` for this layout. The default
+        packs ``generate_frame`` in one pass; animations that can produce bytes
+        directly may override it.
+        """
+        return pack_frame_rgb(self.generate_frame(time_elapsed, frame_count), self.get_pixel_count())
     
     def get_parameter_schema(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -65,52 +321,71 @@ class AnimationBase(ABC):
         Returns:
             Dict with parameter definitions including type, range, description
         """
-        return {
-            'speed': {
-                'type': 'float',
-                'min': 0.1,
-                'max': 5.0,
-                'default': 1.0,
-                'description': 'Animation speed multiplier'
-            },
-            'brightness': {
-                'type': 'float',
-                'min': 0.0,
-                'max': 1.0,
-                'default': 1.0,
-                'description': 'Overall brightness (0.0 - 1.0)'
-            },
-            'color_saturation': {
-                'type': 'float',
-                'min': 0.0,
-                'max': 1.0,
-                'default': 1.0,
-                'description': 'Color saturation (0.0 - 1.0)'
-            },
-            'color_value': {
-                'type': 'float',
-                'min': 0.0,
-                'max': 1.0,
-                'default': 1.0,
-                'description': 'Color value/brightness (0.0 - 1.0)'
-            }
-        }
+        return dict(_DEFAULT_PARAM_SCHEMA)
     
+    @property
+    def params(self) -> Dict[str, Any]:
+        """Current parameter values; assigning a new dict re-syncs the hot parameters"""
+        return self._params
+
+    @params.setter
+    def params(self, value: Dict[str, Any]):
+        self._params = value
+        self._sync_hot_params()
+
+    def _sync_hot_params(self):
+        """
+        Mirror the per-frame base parameters into plain attributes
+
+        Hot paths read ``self._brightness`` and friends instead of doing a
+        ``params.get`` with a default on every pixel. Call after changing
+        ``params`` in place; ``update_parameters`` and assigning ``params`` do.
+        """
+        params = self._params
+        self._speed = params.get('speed', 1.0)
+        self._brightness = params.get('brightness', 1.0)
+        self._color_saturation = params.get('color_saturation', 1.0)
+        self._color_value = params.get('color_value', 1.0)
+        # Fixed-point brightness for the integer scaling helpers
+        self._brightness_q8 = brightness_q8(self._brightness)
+
     def update_parameters(self, new_params: Dict[str, Any]):
         """Update animation parameters in real-time"""
-        self.params.update(new_params)
+        self._params.update(new_params)
+        self._sync_hot_params()
     
     def get_info(self) -> Dict[str, Any]:
-        """Get animation metadata"""
-        return {
-            'name': self.name,
-            'description': self.description,
-            'author': self.author,
-            'version': self.version,
-            'parameters': self.get_parameter_schema(),
-            'current_params': self.params
-        }
+        """
+        Get animation metadata
+
+        Everything except ``current_params`` is fixed for the instance, so it is
+        built on the first call and reused; ``current_params`` is a snapshot
+        that later parameter updates don't change.
+        """
+        info_static = self._info_static
+        if info_static is None:
+            info_static = self._info_static = {
+                'name': self.name,
+                'description': self.description,
+                'author': self.author,
+                'version': self.version,
+                'parameters': self.get_parameter_schema(),
+            }
+        return {**info_static, 'current_params': dict(self.params)}
     
+    def reset(self):
+        """
+        Rewind animation state so the next frame matches a fresh instance
+
+        Override to make previews reusable: the manager keeps one preview
+        instance per plugin and calls reset() before each preview only for
+        classes that override this method. Every other plugin is constructed
+        anew for each preview, because this default does nothing and can't
+        undo state accumulated between frames. Animations without such state
+        can opt in with an override that does nothing.
+        """
+        pass
+
     def get_runtime_stats(self) -> Dict[str, Any]:
         """
         Optional hook for animations to expose debugging/telemetry data.
@@ -133,28 +408,172 @@ class AnimationBase(ABC):
         self.stop()
     
     # Utility methods for common operations
-    def hsv_to_rgb(self, h: float, s: float, v: float) -> Tuple[int, int, int]:
-        """Convert HSV to RGB (0-255)"""
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        return int(r * 255), int(g * 255), int(b * 255)
+    # Convert HSV to RGB (0-255); bound directly so per-pixel calls skip a wrapper frame
+    hsv_to_rgb = staticmethod(hsv_to_rgb255)
+
+    def hsv_to_rgb_array(self, hsv: Iterable[Tuple[float, float, float]]) -> List[Tuple[int, int, int]]:
+        """Convert a run of (h, s, v) triples to RGB (0-255), same values as ``hsv_to_rgb``"""
+        return list(starmap(hsv_to_rgb255, hsv))
+
+    def hue_to_rgb(self, h: float, s: float = 1.0, v: float = 1.0) -> Tuple[int, int, int]:
+        """
+        Table-driven HSV to RGB (0-255) with the hue quantized to 1/256 steps
+
+        Saturated full-value colors are a single ``HUE_LUT`` lookup; other
+        saturation/value pairs blend the table color toward white and scale by
+        value. Use ``hsv_to_rgb`` where exact colorsys output matters.
+        """
+        color = HUE_LUT[int(h * 256) & 255]
+        if s == 1.0 and v == 1.0:
+            return color
+        r, g, b = color
+        return (
+            int(v * (255 - s * (255 - r))),
+            int(v * (255 - s * (255 - g))),
+            int(v * (255 - s * (255 - b)))
+        )
+
+    def hue_array_to_rgb(self, hues: Iterable[float]) -> List[Tuple[int, int, int]]:
+        """Saturated full-value colors for a run of hues via ``HUE_LUT`` (see ``hue_to_rgb``)"""
+        lut = HUE_LUT
+        return [lut[int(h * 256) & 255] for h in hues]
     
     def apply_brightness(self, color: Tuple[int, int, int]) -> Tuple[int, int, int]:
-        """Apply brightness parameter to a color"""
+        """Apply brightness parameter to an integer color (fixed-point, no float math)"""
         r, g, b = color
-        brightness = self.params.get('brightness', 1.0)
+        scale = self._brightness_q8
         return (
-            int(r * brightness),
-            int(g * brightness),
-            int(b * brightness)
+            (r * scale) >> 8,
+            (g * scale) >> 8,
+            (b * scale) >> 8
         )
-    
+
+    def hsv_to_rgb_frame(self, hues: List[float], s: float, v: float) -> List[Tuple[int, int, int]]:
+        """Convert a run of hues sharing one saturation/value to RGB (0-255), same values as ``hsv_to_rgb`` on [0, 1)"""
+        return _hsv_run(hues, s, v)
+
+    def compose_frame(self, hues: List[float], s: float, v: float,
+                      gamma: bool = False) -> List[Tuple[int, int, int]]:
+        """
+        Convert hues to final output colors in one pass
+
+        Equivalent to ``apply_brightness_frame(hsv_to_rgb_frame(hues, s, v))``,
+        optionally followed by gamma correction, but brightness and gamma are
+        folded into a 256-entry channel table so every pixel is touched once.
+        """
+        lut = channel_lut(self._brightness, gamma)
+        return _hsv_run(hues, s, v, lut)
+
+    def apply_brightness_frame(self, colors: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """
+        Apply the brightness parameter to a whole list of integer colors in place
+
+        Same result as calling ``apply_brightness`` per pixel, but the
+        parameter is read once and full brightness skips the pass entirely.
+        Byte-range frames are packed, translated through the Q8 table and
+        split back into tuples, all inside C builtins.
+        """
+        scale = self._brightness_q8
+        if scale == 256:
+            return colors
+        if scale < 256:
+            try:
+                packed = bytearray(chain.from_iterable(colors))
+            except (TypeError, ValueError):
+                pass
+            else:
+                colors[:] = unpack_frame_rgb(packed.translate(channel_table(self._brightness)))
+                return colors
+        colors[:] = [
+            ((r * scale) >> 8, (g * scale) >> 8, (b * scale) >> 8)
+            for r, g, b in colors
+        ]
+        return colors
+
+    def apply_brightness_bytes(self, frame: bytearray, gamma: bool = False) -> bytearray:
+        """
+        Apply the brightness parameter (and optionally gamma) to a packed frame in place
+
+        Every channel byte goes through the same Q8 table as ``apply_brightness``
+        in a single ``bytes.translate`` call, so the whole frame is scaled in C.
+        """
+        if gamma or self._brightness_q8 != 256:
+            frame[:] = frame.translate(channel_table(self._brightness, gamma))
+        return frame
+
+    def frame_to_u32(self, colors: List[Tuple[int, int, int]]) -> array:
+        """Pack RGB tuples into one 0x00RRGGBB word per pixel"""
+        return frame_to_u32(colors)
+
+    def apply_brightness_u32(self, pixels: array) -> array:
+        """
+        Apply the brightness parameter to a uint32 pixel array in place
+
+        Red and blue sit 16 bits apart, so one multiply scales both lanes
+        (``0x00FF00FF`` mask) and a second handles green: two multiplies per
+        pixel instead of three, with the same Q8 result as ``apply_brightness``.
+        """
+        scale = min(self._brightness_q8, 256)
+        if scale == 256:
+            return pixels
+        pixels[:] = array(pixels.typecode, [
+            ((((p & 0xFF00FF) * scale) >> 8) & 0xFF00FF) | ((((p & 0xFF00) * scale) >> 8) & 0xFF00)
+            for p in pixels
+        ])
+        return pixels
+
+    def refresh_dimensions(self):
+        """Re-read the controller's layout; only needed if it is reconfigured while this animation exists"""
+        controller = self.controller
+        self.total_leds = controller.total_leds
+        self.strip_count = controller.strip_count
+        self.leds_per_strip = controller.leds_per_strip
+
     def get_pixel_count(self) -> int:
         """Get total number of pixels"""
-        return self.controller.total_leds
+        return self.total_leds
     
     def get_strip_info(self) -> Tuple[int, int]:
         """Get (strip_count, leds_per_strip)"""
-        return self.controller.strip_count, self.controller.leds_per_strip
+        return self.strip_count, self.leds_per_strip
+
+    def get_frame_buffer(self) -> List[Tuple[int, int, int]]:
+        """
+        Get this animation's preallocated frame list (one entry per pixel)
+
+        ``generate_frame`` can assign ``frame[i] = color`` and return it instead
+        of appending into a fresh list every frame. The animation loop copies
+        the result before the next frame is rendered, so reusing it is safe.
+        """
+        total_pixels = self.get_pixel_count()
+        if len(self.frame_buf) != total_pixels:
+            self.frame_buf[:] = black_frame(total_pixels)
+        return self.frame_buf
+
+    def get_byte_buffer(self) -> bytearray:
+        """
+        Get this animation's preallocated packed frame (3 bytes per pixel, R G B)
+
+        Animations can fill it with whole-channel slice assignments such as
+        ``buf[0::3] = reds`` and return it from ``generate_frame``; packed
+        frames go to the controllers without building a tuple per pixel.
+        """
+        size = 3 * self.get_pixel_count()
+        if len(self.byte_buf) != size:
+            self.byte_buf[:] = bytes(size)
+        return self.byte_buf
+
+    def get_u32_buffer(self) -> array:
+        """
+        Get this animation's preallocated uint32 frame (one 0x00RRGGBB word per pixel)
+
+        Like ``get_byte_buffer``, it can be filled and returned from
+        ``generate_frame``; controllers unpack it to bytes with slice copies.
+        """
+        total_pixels = self.get_pixel_count()
+        if len(self.u32_buf) != total_pixels:
+            self.u32_buf = array(U32_TYPECODE, bytes(4 * total_pixels))
+        return self.u32_buf
 
 
 class StatefulAnimationBase(AnimationBase):
@@ -166,10 +585,20 @@ class StatefulAnimationBase(AnimationBase):
     This is perfect for animations like strip tests that hold states for seconds.
     """
 
+    # Seconds stop() waits for the current run to notice stop_event
+    STOP_TIMEOUT = 2.0
+
     def __init__(self, controller, config: Dict[str, Any] = None):
         super().__init__(controller, config)
+        # One worker thread is created on the first start() and reused by
+        # later restarts: start() opens the "go" latch, the worker runs
+        # run_animation() and then sets "done", which stop() waits on
         self.animation_thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        self._go_event = threading.Event()
+        self._done_event = threading.Event()
+        self._done_event.set()
+        self._shutdown = False
 
     @abstractmethod
     def run_animation(self):
@@ -188,23 +617,54 @@ class StatefulAnimationBase(AnimationBase):
         This method should not be called for stateful animations.
         """
         # Return black frame - this shouldn't be used
-        return [(0, 0, 0)] * self.controller.total_leds
+        return list(black_frame(self.total_leds))
+
+    def _worker(self):
+        """Worker thread body: run the animation each time start() opens the go latch"""
+        while True:
+            self._go_event.wait()
+            self._go_event.clear()
+            if self._shutdown:
+                break
+            try:
+                self.run_animation()
+            except Exception as e:
+                print(f"✗ Stateful animation error: {e}")
+            finally:
+                self._done_event.set()
 
     def start(self):
-        """Start the stateful animation in its own thread"""
+        """Start the stateful animation on its worker thread"""
         super().start()
+        thread = self.animation_thread
+        if (thread is not None and thread.is_alive() and not self._done_event.is_set() and
+                thread is not threading.current_thread()):
+            # A stop() that timed out left the last run inside a frame; it must
+            # see the stop request and finish before the worker is reused, or
+            # clearing stop_event below would keep it running as the "new" run
+            self.stop_event.set()
+            if not self._done_event.wait(timeout=self.STOP_TIMEOUT):
+                print("⚠️ Previous stateful run is still finishing; waiting before restarting")
+                self._done_event.wait()
         self.stop_event.clear()
-        self.animation_thread = threading.Thread(target=self.run_animation, daemon=True)
-        self.animation_thread.start()
+        self._done_event.clear()
+        self._shutdown = False
+        if self.animation_thread is None or not self.animation_thread.is_alive():
+            self.animation_thread = threading.Thread(target=self._worker, daemon=True)
+            self.animation_thread.start()
+        self._go_event.set()
 
     def stop(self):
-        """Stop the stateful animation"""
+        """Stop the stateful animation and wait for the current run to finish"""
         super().stop()
         self.stop_event.set()
-        if self.animation_thread and self.animation_thread.is_alive():
-            self.animation_thread.join(timeout=2.0)
+        if (self.animation_thread and self.animation_thread.is_alive() and
+                self.animation_thread is not threading.current_thread()):
+            self._done_event.wait(timeout=self.STOP_TIMEOUT)
 
     def cleanup(self):
-        """Clean up the stateful animation"""
+        """Clean up the stateful animation and retire its worker thread"""
         self.stop()
+        self._shutdown = True
+        self._go_event.set()
         self.animation_thread = None
@@ -5,11 +5,13 @@ Animation plugin loader and manager
 
 import os
 import sys
-import importlib
+import threading
 import importlib.util
-import inspect
-import traceback
-from typing import Dict, List, Type, Optional, Any, Iterable
+from importlib.machinery import (
+    BYTECODE_SUFFIXES, EXTENSION_SUFFIXES, SOURCE_SUFFIXES,
+    ExtensionFileLoader, FileFinder, SourceFileLoader, SourcelessFileLoader
+)
+from typing import Dict, List, Tuple, Type, Optional, Any, Iterable
 from pathlib import Path
 
 from led_layout import DEFAULT_STRIP_COUNT, DEFAULT_LEDS_PER_STRIP
@@ -17,29 +19,63 @@ from led_layout import DEFAULT_STRIP_COUNT, DEFAULT_LEDS_PER_STRIP
 from .animation_base import AnimationBase
 
 
+class _InfoController:
+    """Lightweight controller so plugins that inspect dimensions don't crash during introspection"""
+    strip_count = DEFAULT_STRIP_COUNT
+    leds_per_strip = DEFAULT_LEDS_PER_STRIP
+    total_leds = strip_count * leds_per_strip
+    debug = False
+
+
+_INFO_CONTROLLER = _InfoController()
+
+
 class AnimationPluginLoader:
     """Loads and manages animation plugins"""
     
-    def __init__(self, plugins_dir: str = "animations", allowed_plugins: Optional[Iterable[str]] = None):
+    def __init__(self, plugins_dir: str = "animations", allowed_plugins: Optional[Iterable[str]] = None,
+                 use_scan_cache: bool = True):
         """
         Initialize plugin loader
         
         Args:
             plugins_dir: Directory containing animation plugins
             allowed_plugins: Optional iterable of plugin stems to load (others are ignored)
+            use_scan_cache: Reuse the last directory scan while the directory's
+                mtime is unchanged. Directory mtimes can be coarse (or not
+                updated at all on some network filesystems), so disable this if
+                added plugins go unnoticed.
         """
         self.plugins_dir = Path(plugins_dir)
         self.plugins_dir.mkdir(exist_ok=True)
 
         self.allowed_plugins = set(allowed_plugins) if allowed_plugins else None
         
-        # Ensure plugins directory is in Python path
-        if str(self.plugins_dir.absolute()) not in sys.path:
-            sys.path.insert(0, str(self.plugins_dir.absolute()))
+        # Plugins resolve through a finder that only serves this directory,
+        # instead of putting it on sys.path for every import in the process
+        self._finder = FileFinder(
+            str(self.plugins_dir.absolute()),
+            (ExtensionFileLoader, EXTENSION_SUFFIXES),
+            (SourceFileLoader, SOURCE_SUFFIXES),
+            (SourcelessFileLoader, BYTECODE_SUFFIXES),
+        )
         
         self.loaded_plugins: Dict[str, Type[AnimationBase]] = {}
         self.plugin_modules: Dict[str, Any] = {}
         self.plugin_files: Dict[str, Path] = {}
+        # Metadata read from plugin sources without importing them, see scan_manifest()
+        self.plugin_manifest: Dict[str, Dict[str, Any]] = {}
+        # Scanned plugins whose module has not been executed since they were
+        # registered; get_plugin() imports them on first use
+        self._pending_plugins: set = set()
+        self._lazy_lock = threading.Lock()
+        # Last scan_plugins() result as (directory mtime_ns, plugin names)
+        self.use_scan_cache = use_scan_cache
+        self._scan_cache: Optional[Tuple[int, Tuple[str, ...]]] = None
+        # (mtime_ns, size) of each plugin file as of its last successful load
+        self._plugin_meta: Dict[str, Tuple[int, int]] = {}
+        # get_plugin_info() results per plugin as (source mtime_ns, class, info)
+        self._info_cache: Dict[str, Tuple[Optional[int], Type[AnimationBase], Dict[str, Any]]] = {}
         
     def scan_plugins(self) -> List[str]:
         """
@@ -48,23 +84,107 @@ class AnimationPluginLoader:
         Returns:
             List of plugin names found
         """
+        dir_mtime = None
+        if self.use_scan_cache:
+            try:
+                dir_mtime = self.plugins_dir.stat().st_mtime_ns
+            except OSError:
+                dir_mtime = None
+            cached = self._scan_cache
+            if dir_mtime is not None and cached is not None and cached[0] == dir_mtime:
+                return list(cached[1])
+
         plugin_names = []
         
-        for file_path in self.plugins_dir.glob("*.py"):
-            if file_path.name.startswith("__"):
-                continue
-                
-            plugin_name = file_path.stem
-            if self.allowed_plugins and plugin_name not in self.allowed_plugins:
-                continue
-            plugin_names.append(plugin_name)
-            self.plugin_files[plugin_name] = file_path
-            
+        # A flat listing; scandir avoids glob's pattern matching and only
+        # builds Path objects for the plugins that are kept
+        with os.scandir(self.plugins_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".py") or name.startswith("__") or not entry.is_file():
+                    continue
+
+                plugin_name = name[:-3]
+                if self.allowed_plugins and plugin_name not in self.allowed_plugins:
+                    continue
+                plugin_names.append(plugin_name)
+                self.plugin_files[plugin_name] = self.plugins_dir / name
+
+        if dir_mtime is not None:
+            self._scan_cache = (dir_mtime, tuple(plugin_names))
         return plugin_names
+
+    def invalidate_scan_cache(self):
+        """Force the next scan_plugins() to list the directory again"""
+        self._scan_cache = None
     
+    def scan_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Scan plugins and read their metadata without importing them
+
+        Each file is parsed (not executed) and the string ``ANIMATION_*``
+        attributes of its first animation class are collected. Plugins can
+        then be imported on first use through ``get_plugin``.
+
+        Returns:
+            Dict mapping plugin names to name/description/author/version metadata
+        """
+        manifest = {}
+        for plugin_name in self.scan_plugins():
+            file_path = self.plugin_files[plugin_name]
+            entry = {
+                'plugin_name': plugin_name,
+                'name': plugin_name,
+                'description': 'No description',
+                'author': 'Unknown',
+                'version': '1.0',
+                'file_path': str(file_path),
+            }
+            try:
+                entry.update(self._read_manifest_fields(file_path))
+            except (OSError, SyntaxError, ValueError) as e:
+                print(f"⚠️ Could not read metadata for plugin {plugin_name}: {e}")
+            manifest[plugin_name] = entry
+
+        self.plugin_manifest = manifest
+        self._pending_plugins.update(manifest.keys())
+        return dict(manifest)
+
+    @staticmethod
+    def _read_manifest_fields(file_path: Path) -> Dict[str, str]:
+        """Pull ANIMATION_NAME/DESCRIPTION/AUTHOR/VERSION string constants out of a plugin source"""
+        # Only the deferred-loading path parses sources, so keep ast off the import path
+        import ast
+
+        fields = {
+            'ANIMATION_NAME': 'name',
+            'ANIMATION_DESCRIPTION': 'description',
+            'ANIMATION_AUTHOR': 'author',
+            'ANIMATION_VERSION': 'version',
+        }
+        tree = ast.parse(file_path.read_text(), filename=str(file_path))
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            values = {}
+            for statement in node.body:
+                if (isinstance(statement, ast.Assign) and
+                        len(statement.targets) == 1 and
+                        isinstance(statement.targets[0], ast.Name) and
+                        statement.targets[0].id in fields and
+                        isinstance(statement.value, ast.Constant) and
+                        isinstance(statement.value.value, str)):
+                    values[fields[statement.targets[0].id]] = statement.value.value
+            if 'name' in values:
+                return values
+        return {}
+
     def load_plugin(self, plugin_name: str) -> Optional[Type[AnimationBase]]:
         """
         Load a single animation plugin
+
+        A plugin that is already loaded is returned as-is while its file's
+        mtime and size are unchanged; use ``reload_plugin`` to force a re-import.
         
         Args:
             plugin_name: Name of the plugin to load
@@ -77,9 +197,15 @@ class AnimationPluginLoader:
             if not file_path or not file_path.exists():
                 print(f"Plugin file not found: {plugin_name}")
                 return None
+
+            stat = file_path.stat()
+            file_meta = (stat.st_mtime_ns, stat.st_size)
+            loaded_class = self.loaded_plugins.get(plugin_name)
+            if loaded_class is not None and self._plugin_meta.get(plugin_name) == file_meta:
+                return loaded_class
             
             # Load module from file
-            spec = importlib.util.spec_from_file_location(plugin_name, file_path)
+            spec = self._find_spec(plugin_name, file_path)
             if spec is None or spec.loader is None:
                 print(f"Could not create spec for plugin: {plugin_name}")
                 return None
@@ -95,40 +221,70 @@ class AnimationPluginLoader:
             spec.loader.exec_module(module)
             self.plugin_modules[plugin_name] = module
             
-            # Find animation class in module
+            # Find animation class in module: the subclass bound to the
+            # alphabetically first name, as inspect.getmembers() ordering gave,
+            # but read straight from the module dict without sorting every name
             animation_class = None
-            for name, obj in inspect.getmembers(module):
-                if (inspect.isclass(obj) and 
-                    issubclass(obj, AnimationBase) and 
-                    obj != AnimationBase):
+            class_attr = None
+            for name, obj in vars(module).items():
+                if (isinstance(obj, type) and
+                        obj is not AnimationBase and
+                        issubclass(obj, AnimationBase) and
+                        (class_attr is None or name < class_attr)):
                     animation_class = obj
-                    break
+                    class_attr = name
             
             if animation_class is None:
                 print(f"No animation class found in plugin: {plugin_name}")
                 return None
             
             self.loaded_plugins[plugin_name] = animation_class
+            self._plugin_meta[plugin_name] = file_meta
             print(f"✓ Loaded plugin: {plugin_name} -> {animation_class.__name__}")
             return animation_class
             
         except Exception as e:
             print(f"✗ Failed to load plugin {plugin_name}: {e}")
+            import traceback
             traceback.print_exc()
             return None
     
-    def load_all_plugins(self) -> Dict[str, Type[AnimationBase]]:
+    def _find_spec(self, plugin_name: str, file_path: Path):
+        """Module spec for a plugin file, resolved through the directory's cached finder when possible"""
+        spec = self._finder.find_spec(plugin_name)
+        # The finder may prefer a package or bytecode of the same name; only
+        # take its answer when it resolves to the scanned source file
+        if spec is None or spec.origin != os.path.abspath(file_path):
+            spec = importlib.util.spec_from_file_location(plugin_name, file_path)
+        return spec
+
+    def load_all_plugins(self, lazy: bool = False) -> Dict[str, Type[AnimationBase]]:
         """
         Load all plugins from the plugins directory
         
+        Args:
+            lazy: Only register the plugins; each module is executed the first
+                time ``get_plugin`` asks for it (or by ``preload_all``)
+
+        Returns:
+            Dict mapping plugin names to animation classes (only those already
+            imported when ``lazy`` is set)
+        """
+        self._pending_plugins.update(self.scan_plugins())
+        if lazy:
+            return self.loaded_plugins.copy()
+        return self.preload_all()
+
+    def preload_all(self) -> Dict[str, Type[AnimationBase]]:
+        """
+        Import every registered plugin that hasn't been imported yet
+
         Returns:
             Dict mapping plugin names to animation classes
         """
-        plugin_names = self.scan_plugins()
-        
-        for plugin_name in plugin_names:
-            self.load_plugin(plugin_name)
-        
+        # Import in scan order so loaded_plugins keeps the directory ordering
+        for plugin_name in [name for name in self.plugin_files if name in self._pending_plugins]:
+            self.get_plugin(plugin_name)
         return self.loaded_plugins.copy()
     
     def reload_plugin(self, plugin_name: str) -> Optional[Type[AnimationBase]]:
@@ -142,46 +298,63 @@ class AnimationPluginLoader:
             Reloaded animation class if successful
         """
         print(f"🔄 Reloading plugin: {plugin_name}")
+        self._plugin_meta.pop(plugin_name, None)
         return self.load_plugin(plugin_name)
     
     def get_plugin(self, plugin_name: str) -> Optional[Type[AnimationBase]]:
-        """Get a loaded plugin by name"""
+        """Get a plugin by name, importing a registered-but-unloaded plugin on first use"""
+        if plugin_name in self._pending_plugins:
+            with self._lazy_lock:
+                if plugin_name in self._pending_plugins:
+                    # Only one attempt per registration, so a broken plugin
+                    # isn't re-executed on every lookup
+                    self._pending_plugins.discard(plugin_name)
+                    self.load_plugin(plugin_name)
         return self.loaded_plugins.get(plugin_name)
     
     def get_plugin_file(self, plugin_name: str) -> Optional[Path]:
         """Get the backing file path for a loaded plugin"""
         return self.plugin_files.get(plugin_name)
+
+    def get_plugin_source_mtime(self, plugin_name: str) -> Optional[int]:
+        """Get the plugin file's modification time (ns), or None if it has no readable file"""
+        file_path = self.plugin_files.get(plugin_name)
+        if file_path is None:
+            return None
+        try:
+            return file_path.stat().st_mtime_ns
+        except OSError:
+            return None
     
     def list_plugins(self) -> List[str]:
         """Get list of loaded plugin names"""
         return list(self.loaded_plugins.keys())
     
     def get_plugin_info(self, plugin_name: str) -> Optional[Dict[str, Any]]:
-        """Get metadata about a plugin"""
+        """Get metadata about a plugin (cached while its class and source file are unchanged)"""
         plugin_class = self.get_plugin(plugin_name)
         if plugin_class is None:
             return None
 
-        # Build a lightweight controller so plugins that inspect dimensions don't crash
-        class _InfoController:
-            strip_count = DEFAULT_STRIP_COUNT
-            leds_per_strip = DEFAULT_LEDS_PER_STRIP
-            total_leds = strip_count * leds_per_strip
-            debug = False
+        mtime_ns = self.get_plugin_source_mtime(plugin_name)
+        cached = self._info_cache.get(plugin_name)
+        if cached is not None and cached[0] == mtime_ns and cached[1] is plugin_class:
+            return cached[2]
 
         try:
-            temp_instance = plugin_class(_InfoController())
+            temp_instance = plugin_class(_INFO_CONTROLLER)
             info = temp_instance.get_info()
             info['plugin_name'] = plugin_name
             info['file_path'] = str(self.plugin_files.get(plugin_name, ''))
-            return info
         except Exception as e:
-            return {
+            info = {
                 'plugin_name': plugin_name,
                 'name': plugin_class.__name__,
                 'error': str(e),
                 'file_path': str(self.plugin_files.get(plugin_name, ''))
             }
+        self._info_cache[plugin_name] = (mtime_ns, plugin_class, info)
+        return info
     
     def save_plugin(self, plugin_name: str, plugin_code: str) -> bool:
         """
@@ -200,6 +373,8 @@ class AnimationPluginLoader:
                 f.write(plugin_code)
             
             self.plugin_files[plugin_name] = file_path
+            self.invalidate_scan_cache()
+            self._finder.invalidate_caches()
             print(f"✓ Saved plugin: {plugin_name}")
             return True
             
@@ -9,10 +9,75 @@ The screen clears when it fills up.
 
 import random
 import math
-from typing import List, Tuple, Dict, Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from animation_system import AnimationBase
 
 
+def _lit_cells(bitmap: List[str]) -> List[Tuple[int, int]]:
+    """(dy, dx) offsets of the lit ('X') cells of a bitmap, row by row"""
+    return [(dy, dx) for dy, row in enumerate(bitmap) for dx, cell in enumerate(row) if cell == 'X']
+
+
+def _compile_kernel(name: str, args: str, lines: List[str]) -> Callable:
+    """Build a function from generated straight-line statements"""
+    source = f"def {name}({args}):\n" + "".join(f"    {line}\n" for line in lines or ["pass"])
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<ascii_drop {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+@lru_cache(maxsize=8)
+def _serpentine_flipper(strip_count: int, leds_per_strip: int) -> Callable[[bytearray], None]:
+    """Compile ``flip(lit_map)`` reversing every odd strip, with the strip bounds baked in"""
+    lines = []
+    for strip in range(1, strip_count, 2):
+        start, end = strip * leds_per_strip, (strip + 1) * leds_per_strip
+        lines.append(f"lit_map[{start}:{end}] = lit_map[{start}:{end}][::-1]")
+    return _compile_kernel("flip", "lit_map", lines)
+
+
+@lru_cache(maxsize=256)
+def _glyph_stamper(offsets: Tuple[int, ...]) -> Callable[[bytearray, int], None]:
+    """Compile ``stamp(lit_map, origin)`` that sets each flat lit-cell offset, unrolled"""
+    return _compile_kernel("stamp", "lit_map, origin",
+                           [f"lit_map[origin + {offset}] = 1" for offset in offsets])
+
+
+def _row_mask(row: str) -> int:
+    """Bitmap row as an int with bit dx set for each lit ('X') cell"""
+    return sum(1 << dx for dx, cell in enumerate(row) if cell == 'X')
+
+
+def _check_landed(top_y: int, x: int, lit_rows: List[Tuple[int, int]], row_bits: List[int],
+                  strip_count: int) -> bool:
+    """True when any lit cell of a glyph at (top_y, x) rests on a filled grid cell
+
+    Each non-empty glyph row is tested against the filled bits of the strip
+    below it with a single AND instead of one lookup per cell.
+    """
+    for dy, mask in lit_rows:
+        strip = top_y + dy + 1
+        if 0 <= strip < strip_count and (mask << x) & row_bits[strip]:
+            return True
+    return False
+
+
+def _stamp_glyph(top_y: int, x: int, lit: List[Tuple[int, int]], grid: bytearray,
+                 strip_count: int, leds_per_strip: int) -> int:
+    """Fill the grid cells under a glyph's lit cells, clipped to the grid; returns how many were empty"""
+    added = 0
+    for dy, dx in lit:
+        strip = top_y + dy
+        led = x + dx
+        if 0 <= strip < strip_count and 0 <= led < leds_per_strip:
+            cell = strip * leds_per_strip + led
+            if not grid[cell]:
+                grid[cell] = 1
+                added += 1
+    return added
+
+
 class AsciiDropAnimation(AnimationBase):
     """ASCII characters dropping like Tetris pieces"""
 
@@ -367,6 +432,19 @@ class AsciiDropAnimation(AnimationBase):
         ]
     }
 
+    # Lit cells of each bitmap, so the hot loops only visit pixels that draw
+    LIT_PIXELS: Dict[str, List[Tuple[int, int]]] = {
+        char: _lit_cells(bitmap) for char, bitmap in CHARACTER_BITMAPS.items()
+    }
+    # One byte per bitmap row, bit dx set for each lit cell (glyphs are 5 wide)
+    ROW_MASKS: Dict[str, bytes] = {
+        char: bytes(_row_mask(row) for row in bitmap) for char, bitmap in CHARACTER_BITMAPS.items()
+    }
+    # (dy, row mask) of just the rows with lit cells; every glyph has at least one blank row
+    LIT_ROWS: Dict[str, List[Tuple[int, int]]] = {
+        char: [(dy, mask) for dy, mask in enumerate(masks) if mask] for char, masks in ROW_MASKS.items()
+    }
+
     def __init__(self, controller, config: Dict[str, Any] = None):
         super().__init__(controller, config)
         
@@ -385,20 +463,44 @@ class AsciiDropAnimation(AnimationBase):
         
         self.params = {**self.default_params, **self.config}
         
-        # Animation state
-        self.falling_characters: List[Dict[str, Any]] = []
+        # Animation state; falling characters are kept as parallel lists
+        # (top row, left column, glyph) indexed together
+        self.falling_y: List[float] = []
+        self.falling_x: List[int] = []
+        self.falling_chars: List[str] = []
         self.last_spawn_time = 0.0
         self.phrase_index = 0
-        self.grid_state: List[List[Optional[str]]] = []
+        # One byte per pixel in strip-major order: 0 = empty, 1 = filled
+        self.grid_state = bytearray()
+        # Scratch copy of the grid with the falling characters drawn in, reused every frame
+        self._lit_map = bytearray()
+        # (char, leds_per_strip) -> compiled glyph stamper, see _stamper
+        self._stamper_cache: Dict[Tuple[str, int], Callable[[bytearray, int], None]] = {}
         self.last_time = None
+        # Pixel count of the last render; a resized frame buffer forces a redraw
+        self._rendered_size = -1
+        # Caller buffers (the loop's front/back pair) already holding the last render
+        self._synced_buffers: List[List[Tuple[int, int, int]]] = []
 
         self._reset_grid()
 
     def _reset_grid(self):
         """Reset the grid state"""
         strip_count, leds_per_strip = self.get_strip_info()
-        self.grid_state = [[None for _ in range(leds_per_strip)] for _ in range(strip_count)]
-        self.falling_characters = []
+        self.grid_state = bytearray(strip_count * leds_per_strip)
+        self._filled_count = 0
+        # Fewest filled cells that make the grid more than 80% full (never, if it has no cells)
+        total_pixels = len(self.grid_state)
+        threshold = int(total_pixels * 0.8)
+        while total_pixels and threshold / total_pixels <= 0.8:
+            threshold += 1
+        self._full_threshold = threshold if total_pixels else 1
+        self._dirty = True
+        # Filled cells of each strip as bits (bit led), for row-at-a-time collision tests
+        self._row_bits = [0] * strip_count
+        self.falling_y = []
+        self.falling_x = []
+        self.falling_chars = []
 
     def get_parameter_schema(self) -> Dict[str, Dict[str, Any]]:
         schema = super().get_parameter_schema()
@@ -438,6 +540,33 @@ class AsciiDropAnimation(AnimationBase):
 
     def generate_frame(self, time_elapsed: float, frame_count: int) -> List[Tuple[int, int, int]]:
         """Generate a frame of the ASCII drop animation"""
+        return self._step(time_elapsed)
+
+    def generate_frame_into(self, time_elapsed: float, frame_count: int,
+                            out: List[Tuple[int, int, int]]) -> None:
+        """
+        Copy the frame into the animation loop's buffer, only if it doesn't already hold it
+
+        The loop alternates between two buffers, so an unchanged frame costs a
+        copy into each of them once and nothing afterwards.
+        """
+        frame = self._step(time_elapsed)
+        synced = self._synced_buffers
+        for buffer in synced:
+            if buffer is out and len(out) == len(frame):
+                return
+        out[:] = frame
+        synced.append(out)
+        if len(synced) > 2:
+            del synced[0]
+
+    def _step(self, time_elapsed: float) -> List[Tuple[int, int, int]]:
+        """Advance the simulation to ``time_elapsed`` and return the frame buffer
+
+        The buffer is only re-rendered when something visible changed: a
+        character moved to a new row, landed, the grid was cleared, or the
+        parameters were updated. Otherwise last frame's pixels are returned.
+        """
         if self.last_time is None:
             self.last_time = time_elapsed
 
@@ -445,7 +574,6 @@ class AsciiDropAnimation(AnimationBase):
         self.last_time = time_elapsed
 
         strip_count, leds_per_strip = self.get_strip_info()
-        total_pixels = self.get_pixel_count()
 
         # Check if we need to clear the screen (when it's mostly full)
         if self._is_screen_full():
@@ -457,22 +585,19 @@ class AsciiDropAnimation(AnimationBase):
         # Update falling characters
         self._update_falling_characters(dt)
 
-        # Render the frame
-        return self._render_frame(strip_count, leds_per_strip, total_pixels)
+        # Render the frame if anything visible changed
+        frame = self.get_frame_buffer()
+        if self._dirty or len(frame) != self._rendered_size:
+            self._render_frame(strip_count, leds_per_strip, frame)
+            self._dirty = False
+            self._rendered_size = len(frame)
+            self._synced_buffers = []
+        return frame
 
     def _is_screen_full(self) -> bool:
         """Check if the screen is mostly full and needs clearing"""
-        strip_count, leds_per_strip = self.get_strip_info()
-        filled_pixels = 0
-        total_pixels = strip_count * leds_per_strip
-
-        for strip in range(strip_count):
-            for led in range(leds_per_strip):
-                if self.grid_state[strip][led] is not None:
-                    filled_pixels += 1
-
-        # Clear when 80% full
-        return filled_pixels / total_pixels > 0.8
+        # Clear when 80% full; placements keep the filled count current
+        return self._filled_count >= self._full_threshold
 
     def _spawn_characters(self, time_elapsed: float, dt: float):
         """Spawn new characters from the phrase"""
@@ -498,123 +623,125 @@ class AsciiDropAnimation(AnimationBase):
         max_start_x = max(0, leds_per_strip - char_width - 1)
         start_x = random.randint(1, max_start_x) if max_start_x > 1 else 0
 
-        character = {
-            'char': char,
-            'x': start_x,
-            'y': -len(bitmap),  # Start above the grid
-            'bitmap': bitmap
-        }
-
-        self.falling_characters.append(character)
+        self.falling_y.append(-len(bitmap))  # Start above the grid
+        self.falling_x.append(start_x)
+        self.falling_chars.append(char)
 
     def _update_falling_characters(self, dt: float):
         """Update positions of falling characters"""
         drop_speed = float(self.params.get('drop_speed', 2.0))
         strip_count, leds_per_strip = self.get_strip_info()
+        row_bits = self._row_bits
+        row_masks = self.ROW_MASKS
+        lit_rows = self.LIT_ROWS
 
-        active_characters = []
+        # Move every character down in one pass
+        step = drop_speed * dt
+        falling_y = [y + step for y in self.falling_y]
 
-        for char_data in self.falling_characters:
-            # Move character down
-            char_data['y'] += drop_speed * dt
+        active_y, active_x, active_chars = [], [], []
 
-            # Check if character has landed or gone off screen
-            bitmap = char_data['bitmap']
-            char_height = len(bitmap)
-            char_width = len(bitmap[0])
-
-            # Check for collision with bottom or existing characters
-            landed = False
-            bottom_y = int(char_data['y']) + char_height
-
-            if bottom_y >= strip_count:
-                # Hit bottom
-                landed = True
-            else:
-                # Check collision with existing characters
-                for dy in range(char_height):
-                    for dx in range(char_width):
-                        if bitmap[dy][dx] == 'X':
-                            check_strip = int(char_data['y']) + dy + 1
-                            check_led = char_data['x'] + dx
-
-                            if (0 <= check_strip < strip_count and
-                                0 <= check_led < leds_per_strip and
-                                self.grid_state[check_strip][check_led] is not None):
-                                landed = True
-                                break
-                    if landed:
-                        break
+        for y, old_y, x, char in zip(falling_y, self.falling_y, self.falling_x, self.falling_chars):
+            # Landed on the bottom or on top of existing characters?
+            top_y = int(y)
+            if top_y != int(old_y):
+                self._dirty = True
+            landed = (top_y + len(row_masks[char]) >= strip_count or
+                      _check_landed(top_y, x, lit_rows[char], row_bits, strip_count))
 
             if landed:
                 # Place character in grid
-                self._place_character_in_grid(char_data)
+                self._place_character_in_grid(char, x, top_y)
             else:
                 # Keep falling
-                active_characters.append(char_data)
+                active_y.append(y)
+                active_x.append(x)
+                active_chars.append(char)
 
-        self.falling_characters = active_characters
+        self.falling_y = active_y
+        self.falling_x = active_x
+        self.falling_chars = active_chars
 
-    def _place_character_in_grid(self, char_data: Dict[str, Any]):
+    def _place_character_in_grid(self, char: str, x: int, top_y: int):
         """Place a landed character in the grid state"""
         strip_count, leds_per_strip = self.get_strip_info()
-        bitmap = char_data['bitmap']
-        char_height = len(bitmap)
-        char_width = len(bitmap[0])
-
-        for dy in range(char_height):
-            for dx in range(char_width):
-                if bitmap[dy][dx] == 'X':
-                    grid_strip = int(char_data['y']) + dy
-                    grid_led = char_data['x'] + dx
-
-                    if (0 <= grid_strip < strip_count and
-                        0 <= grid_led < leds_per_strip):
-                        self.grid_state[grid_strip][grid_led] = char_data['char']
-
-    def _render_frame(self, strip_count: int, leds_per_strip: int, total_pixels: int) -> List[Tuple[int, int, int]]:
-        """Render the current frame"""
-        # Get colors from parameters
-        char_color = (
-            int(self.params.get('character_color_red', 0)),
-            int(self.params.get('character_color_green', 255)),
-            int(self.params.get('character_color_blue', 100))
-        )
-
-        background_color = (
-            int(self.params.get('background_red', 0)),
-            int(self.params.get('background_green', 0)),
-            int(self.params.get('background_blue', 5))
-        )
+        self._filled_count += _stamp_glyph(top_y, x, self.LIT_PIXELS[char],
+                                           self.grid_state, strip_count, leds_per_strip)
+        self._dirty = True
+
+        row_bits = self._row_bits
+        strip_mask = (1 << leds_per_strip) - 1
+        for dy, mask in self.LIT_ROWS[char]:
+            strip = top_y + dy
+            if 0 <= strip < strip_count:
+                row_bits[strip] |= (mask << x) & strip_mask
+
+    def _stamper(self, char: str, leds_per_strip: int) -> Callable[[bytearray, int], None]:
+        """Glyph stamper with the lit cells' flat offsets from the top-left pixel baked in"""
+        key = (char, leds_per_strip)
+        stamper = self._stamper_cache.get(key)
+        if stamper is None:
+            offsets = tuple(dy * leds_per_strip + dx for dy, dx in self.LIT_PIXELS[char])
+            stamper = self._stamper_cache[key] = _glyph_stamper(offsets)
+        return stamper
+
+    def _sync_hot_params(self):
+        """Also drop the scaled colors and redraw; _frame_colors rebuilds them on the next render"""
+        super()._sync_hot_params()
+        self._colors = None
+        self._dirty = True
+
+    def _frame_colors(self) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+        """(background, character) colors with brightness applied, cached until params change"""
+        colors = self._colors
+        if colors is None:
+            char_color = (
+                int(self.params.get('character_color_red', 0)),
+                int(self.params.get('character_color_green', 255)),
+                int(self.params.get('character_color_blue', 100))
+            )
+
+            background_color = (
+                int(self.params.get('background_red', 0)),
+                int(self.params.get('background_green', 0)),
+                int(self.params.get('background_blue', 5))
+            )
+
+            colors = self._colors = (self.apply_brightness(background_color),
+                                     self.apply_brightness(char_color))
+        return colors
+
+    def _render_frame(self, strip_count: int, leds_per_strip: int,
+                      pixel_colors: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """Render the current frame into ``pixel_colors`` (one entry per pixel) and return it"""
+        # Every pixel is one of these two colors
+        colors = self._frame_colors()
 
         serpentine = bool(self.params.get('serpentine', False))
 
-        # Initialize frame with background
-        pixel_colors = [self.apply_brightness(background_color)] * total_pixels
-
-        # Render placed characters in grid
-        for strip in range(strip_count):
-            for led in range(leds_per_strip):
-                if self.grid_state[strip][led] is not None:
-                    mapped_led = led if not (serpentine and strip % 2 == 1) else (leds_per_strip - 1 - led)
-                    pixel_index = strip * leds_per_strip + mapped_led
-                    pixel_colors[pixel_index] = self.apply_brightness(char_color)
-
-        # Render falling characters
-        for char_data in self.falling_characters:
-            bitmap = char_data['bitmap']
-            char_height = len(bitmap)
-            char_width = len(bitmap[0])
-
-            for dy in range(char_height):
-                for dx in range(char_width):
-                    if bitmap[dy][dx] == 'X':
-                        strip = int(char_data['y']) + dy
-                        led = char_data['x'] + dx
-
-                        if (0 <= strip < strip_count and 0 <= led < leds_per_strip):
-                            mapped_led = led if not (serpentine and strip % 2 == 1) else (leds_per_strip - 1 - led)
-                            pixel_index = strip * leds_per_strip + mapped_led
-                            pixel_colors[pixel_index] = self.apply_brightness(char_color)
-
+        # Lit map for this frame: landed cells plus every falling character
+        lit_map = self._lit_map
+        lit_map[:] = self.grid_state
+        bitmaps = self.CHARACTER_BITMAPS
+        lit_pixels = self.LIT_PIXELS
+        for y, x, char in zip(self.falling_y, self.falling_x, self.falling_chars):
+            top_y = int(y)
+            bitmap = bitmaps[char]
+            if 0 <= top_y and top_y + len(bitmap) <= strip_count and 0 <= x and x + len(bitmap[0]) <= leds_per_strip:
+                # Fully on the grid: unrolled stores at fixed offsets, no per-cell clipping
+                self._stamper(char, leds_per_strip)(lit_map, top_y * leds_per_strip + x)
+            else:
+                # Still entering from the top (or wider than the grid): clip each cell
+                _stamp_glyph(top_y, x, lit_pixels[char], lit_map, strip_count, leds_per_strip)
+
+        # Serpentine wiring runs every odd strip backwards
+        if serpentine:
+            _serpentine_flipper(strip_count, leds_per_strip)(lit_map)
+
+        # One C-level lookup per pixel: 0 -> background, 1 -> character
+        total_pixels = len(pixel_colors)
+        count = min(len(lit_map), total_pixels)
+        pixel_colors[:count] = map(colors.__getitem__, lit_map if count == len(lit_map) else lit_map[:count])
+        if count < total_pixels:
+            pixel_colors[count:] = [colors[0]] * (total_pixels - count)
         return pixel_colors
@@ -6,7 +6,6 @@ Turns on each LED one by one in sequence to help diagnose which strips are worki
 Useful for testing LED strip connectivity and identifying dead strips or LEDs.
 """
 
-import time
 from typing import List, Tuple, Dict, Any
 from animation_system import AnimationBase
 from led_layout import DEFAULT_STRIP_COUNT, DEFAULT_LEDS_PER_STRIP
@@ -29,21 +28,23 @@ class DebugSequentialAnimation(AnimationBase):
         self.brightness = self.config.get('brightness', 255) # LED brightness (0-255)
         self.color = self.config.get('color', (255, 255, 255))  # RGB color
         self.show_strip_info = self.config.get('show_strip_info', True)
+        self._update_lit_color()
 
         # State tracking
         self.current_strip = 0
         self.current_led = 0
-        self.last_update = 0
-        self.phase = 'lighting'  # 'lighting' or 'holding'
-        self.hold_start = 0
+        self.last_update = None  # time_elapsed of the last advance
 
         # Efficiency tracking - only send data when LED changes
-        self.last_frame = None
         self.frame_changed = True
         
         # Get controller dimensions
         self.num_strips = getattr(controller, 'strip_count', DEFAULT_STRIP_COUNT)
         self.leds_per_strip = getattr(controller, 'leds_per_strip', DEFAULT_LEDS_PER_STRIP)
+
+        # One frame kept for the whole run: advancing only touches the old and new LED
+        self._frame_buf: List[Tuple[int, int, int]] = [(0, 0, 0)] * (self.num_strips * self.leds_per_strip)
+        self._lit_index = None
         
         print(f"🔍 Debug Sequential Animation initialized:")
         print(f"   Strips: {self.num_strips}")
@@ -122,55 +123,54 @@ class DebugSequentialAnimation(AnimationBase):
         
         if 'show_strip_info' in params:
             self.show_strip_info = bool(params['show_strip_info'])
+
+        self._update_lit_color()
+
+    def _update_lit_color(self):
+        """Scale the LED color by brightness once, not on every advance"""
+        self.lit_color = tuple(int(channel * self.brightness / 255) for channel in self.color)
     
     def generate_frame(self, time_elapsed: float, frame_count: int) -> List[Tuple[int, int, int]]:
         """Generate animation frame - only when LED changes for efficiency"""
-        current_time = time.time()
-
-        # Check if it's time to advance to next LED
-        if current_time - self.last_update >= self.led_delay:
+        # Check if it's time to advance to next LED (always on the first frame)
+        if self.last_update is None or time_elapsed - self.last_update >= self.led_delay:
             # Mark that frame has changed
             self.frame_changed = True
 
             # Advance to next LED
             self._advance_to_next_led()
-            self.last_update = current_time
+            self.last_update = time_elapsed
 
-            # Print progress info
-            if self.show_strip_info:
-                total_led = self.current_strip * self.leds_per_strip + self.current_led + 1
-                total_leds = self.num_strips * self.leds_per_strip
-                print(f"🔍 Strip {self.current_strip + 1}/{self.num_strips}, "
-                      f"LED {self.current_led + 1}/{self.leds_per_strip} "
-                      f"(Total: {total_led}/{total_leds})")
-
-        # Only generate new frame if LED changed
+        # Only touch the frame if LED changed
         if self.frame_changed:
-            # Initialize frame with all LEDs off (flat list)
-            total_pixels = self.num_strips * self.leds_per_strip
-            frame = [(0, 0, 0)] * total_pixels
+            frame = self._frame_buf
+            self._clear_lit_led()
 
             # Turn on current LED
             if self.current_strip < self.num_strips and self.current_led < self.leds_per_strip:
-                # Apply brightness scaling
-                r = int(self.color[0] * self.brightness / 255)
-                g = int(self.color[1] * self.brightness / 255)
-                b = int(self.color[2] * self.brightness / 255)
-
                 # Calculate flat pixel index
                 pixel_index = self.current_strip * self.leds_per_strip + self.current_led
-                frame[pixel_index] = (r, g, b)
+                frame[pixel_index] = self.lit_color
+                self._lit_index = pixel_index
 
-                # Debug output for first few LEDs and strip transitions
-                if (self.current_strip == 0 and self.current_led < 10) or self.current_led == 0:
-                    print(f"🔍 Lighting LED: Strip {self.current_strip}, LED {self.current_led}, Pixel {pixel_index}, Color {(r,g,b)}")
+                # Progress output only for the first few LEDs and strip transitions,
+                # so a long run doesn't print (and block on stdout) every advance
+                if self.show_strip_info and (self.current_led == 0 or (self.current_strip == 0 and self.current_led < 10)):
+                    total_leds = self.num_strips * self.leds_per_strip
+                    print(f"🔍 Strip {self.current_strip + 1}/{self.num_strips}, "
+                          f"LED {self.current_led + 1}/{self.leds_per_strip} "
+                          f"(Total: {pixel_index + 1}/{total_leds}), Color {self.lit_color}")
 
-            self.last_frame = frame
             self.frame_changed = False
-            return frame
-        else:
-            # Return cached frame if no change
-            return self.last_frame if self.last_frame else [(0, 0, 0)] * (self.num_strips * self.leds_per_strip)
+
+        # Same list every call; the animation loop copies it before the next frame
+        return self._frame_buf
+
+    def _clear_lit_led(self):
+        """Turn the currently lit LED back off in the kept frame"""
+        if self._lit_index is not None:
+            self._frame_buf[self._lit_index] = (0, 0, 0)
+            self._lit_index = None
     
     def _advance_to_next_led(self):
         """Advance to the next LED in sequence"""
@@ -195,9 +195,7 @@ class DebugSequentialAnimation(AnimationBase):
         """Reset animation to beginning"""
         self.current_strip = 0
         self.current_led = 0
-        self.last_update = 0
-        self.phase = 'lighting'
-        self.hold_start = 0
-        self.last_frame = None
+        self.last_update = None
+        self._clear_lit_led()
         self.frame_changed = True
         print("🔄 Debug Sequential Animation reset")
@@ -8,7 +8,11 @@ Various special effects like sparkle, fire, and matrix rain.
 import math
 import random
 from typing import List, Tuple, Dict, Any
-from animation_system import AnimationBase
+from animation_system import AnimationBase, mix_linear
+
+# One sine period in fixed phase steps; a power of two so phases wrap with a mask
+SINE_STEPS = 1024
+SINE_TABLE = tuple(math.sin(2 * math.pi * step / SINE_STEPS) for step in range(SINE_STEPS))
 
 
 class SparkleAnimation(AnimationBase):
@@ -121,6 +125,50 @@ class WaveAnimation(AnimationBase):
         })
         
         self.params = {**self.default_params, **self.config}
+
+        # (leds_per_strip, frequency) -> per-LED spatial phase step, see _spatial_steps
+        self._phase_table: Tuple[Tuple[int, float], List[int]] = ((0, 0.0), [])
+        # Wave color at every SINE_TABLE step, as tuples and packed, see _wave_colors
+        self._color_table: Tuple[Any, List[Tuple[int, int, int]], List[bytes]] = (None, [], [])
+
+    def _spatial_steps(self, leds_per_strip: int, frequency: float) -> List[int]:
+        """Position part of each LED's phase in SINE_STEPS units; rebuilt only when the strip length or frequency changes"""
+        key, steps = self._phase_table
+        if key != (leds_per_strip, frequency):
+            steps = [round(led / leds_per_strip * frequency * SINE_STEPS) for led in range(leds_per_strip)]
+            self._phase_table = ((leds_per_strip, frequency), steps)
+        return steps
+
+    def _wave_colors(self, packed: bool = False) -> List[Any]:
+        """
+        Blended, brightness-scaled color for each sine table step
+
+        Rebuilt only when the colors, amplitude or brightness change. With
+        ``packed`` the colors come back as 3-byte R, G, B strings.
+        """
+        bg_color, wave_color, amplitude = self._bg_color, self._wave_color, self._amplitude
+        key = (bg_color, wave_color, amplitude, self._brightness_q8)
+        cached_key, colors, packed_colors = self._color_table
+        if cached_key != key:
+            apply_brightness = self.apply_brightness
+            colors = []
+            for sine in SINE_TABLE:
+                wave_value = (sine * amplitude + 1) / 2  # Normalize to 0-1
+
+                # Interpolate between background and wave color in linear light
+                colors.append(apply_brightness(mix_linear(bg_color, wave_color, wave_value)))
+            packed_colors = [bytes(color) for color in colors]
+            self._color_table = (key, colors, packed_colors)
+        return packed_colors if packed else colors
+
+    def _strip_steps(self, time_elapsed: float, leds_per_strip: int) -> List[int]:
+        """Wrapped sine table step of each LED along a strip at this time"""
+        time_step = round(time_elapsed * self._speed * SINE_STEPS)
+        wrap = SINE_STEPS - 1
+        return [
+            (step + time_step) & wrap
+            for step in self._spatial_steps(leds_per_strip, self._frequency)
+        ]
     
     def get_parameter_schema(self) -> Dict[str, Dict[str, Any]]:
         schema = super().get_parameter_schema()
@@ -136,41 +184,40 @@ class WaveAnimation(AnimationBase):
         })
         return schema
     
+    def _sync_hot_params(self):
+        """Also mirror the wave colors and shape so frames skip the params lookups"""
+        super()._sync_hot_params()
+        params = self._params
+        self._wave_color = (
+            params.get('wave_color_red', 0),
+            params.get('wave_color_green', 255),
+            params.get('wave_color_blue', 255)
+        )
+        self._bg_color = (
+            params.get('background_red', 0),
+            params.get('background_green', 0),
+            params.get('background_blue', 20)
+        )
+        self._frequency = params.get('frequency', 2.0)
+        self._amplitude = params.get('amplitude', 1.0)
+
     def generate_frame(self, time_elapsed: float, frame_count: int) -> List[Tuple[int, int, int]]:
         """Generate wave frame"""
         strip_count, leds_per_strip = self.get_strip_info()
         
-        wave_color = (
-            self.params.get('wave_color_red', 0),
-            self.params.get('wave_color_green', 255),
-            self.params.get('wave_color_blue', 255)
-        )
-        
-        bg_color = (
-            self.params.get('background_red', 0),
-            self.params.get('background_green', 0),
-            self.params.get('background_blue', 20)
-        )
-        
-        frequency = self.params.get('frequency', 2.0)
-        speed = self.params.get('speed', 1.0)
-        amplitude = self.params.get('amplitude', 1.0)
-        
-        pixel_colors = []
-        
-        for strip in range(strip_count):
-            for led in range(leds_per_strip):
-                # Calculate wave position
-                x = led / leds_per_strip
-                wave_phase = x * frequency * 2 * math.pi + time_elapsed * speed * 2 * math.pi
-                wave_value = (math.sin(wave_phase) * amplitude + 1) / 2  # Normalize to 0-1
-                
-                # Interpolate between background and wave color
-                r = int(bg_color[0] * (1 - wave_value) + wave_color[0] * wave_value)
-                g = int(bg_color[1] * (1 - wave_value) + wave_color[1] * wave_value)
-                b = int(bg_color[2] * (1 - wave_value) + wave_color[2] * wave_value)
-                
-                color = self.apply_brightness((r, g, b))
-                pixel_colors.append(color)
-        
-        return pixel_colors
+        # Phases are wrapped onto SINE_TABLE steps, so each LED's color is a
+        # single table lookup. The wave only depends on the LED position along
+        # a strip, so render one strip and repeat it for every strip
+        colors = self._wave_colors()
+        strip_colors = list(map(colors.__getitem__, self._strip_steps(time_elapsed, leds_per_strip)))
+
+        return strip_colors * strip_count
+
+    def generate_frame_bytes(self, time_elapsed: float, frame_count: int) -> bytearray:
+        """Join one packed strip from the table and repeat it straight into the byte buffer"""
+        strip_count, leds_per_strip = self.get_strip_info()
+        colors = self._wave_colors(packed=True)
+        strip = b"".join(map(colors.__getitem__, self._strip_steps(time_elapsed, leds_per_strip)))
+        frame = self.get_byte_buffer()
+        frame[:] = strip * strip_count
+        return frame
@@ -6,8 +6,35 @@ Renders a pixel-art emoji centered on the LED grid with a gentle pulse.
 """
 
 import math
-from typing import List, Tuple, Dict, Any
-from animation_system import AnimationBase
+from typing import Any, Callable, Dict, List, Tuple
+from animation_system import AnimationBase, mix_linear
+
+
+def _compile_scatter(layout: List[Tuple[str, List[int]]], packed: bool) -> Callable[[Any, Dict[str, Tuple[int, int, int]]], None]:
+    """
+    Compile ``draw(frame, palette)`` writing each cell's palette color to its pixels
+
+    The pixel indices are baked in as one chained assignment per cell, so a
+    frame is drawn without looping or bounds checks. With ``packed`` the
+    targets are 3-byte slices of a packed R, G, B frame.
+    """
+    lines = []
+    for cell, indices in layout:
+        if packed:
+            targets = " = ".join(f"frame[{3 * index}:{3 * index + 3}]" for index in indices)
+            value = "bytes(color)"
+        else:
+            targets = " = ".join(f"frame[{index}]" for index in indices)
+            value = "color"
+        lines += [
+            f"color = palette.get({cell!r})",
+            "if color is not None:",
+            f"    {targets} = {value}",
+        ]
+    source = "def draw(frame, palette):\n" + "".join(f"    {line}\n" for line in lines or ["pass"])
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<emoji draw>", "exec"), namespace)
+    return namespace["draw"]
 
 
 class EmojiAnimation(AnimationBase):
@@ -417,6 +444,10 @@ class EmojiAnimation(AnimationBase):
         ]
     }
 
+    # Pulse and accent waves are quantized to this many steps per 0-1 swing;
+    # the steepest palette channel moves under a third of a level per step
+    PULSE_STEPS = 256
+
     def __init__(self, controller, config: Dict[str, Any] = None):
         super().__init__(controller, config)
 
@@ -439,6 +470,19 @@ class EmojiAnimation(AnimationBase):
 
         self.params = {**self.default_params, **self.config}
 
+        # Pixel indices per pattern cell and the inputs they were built from, see _pixel_layout
+        self._layout_key: Any = None
+        self._layout: List[Tuple[str, List[int]]] = []
+        # Palette cells the layout actually shows, background first
+        self._layout_cells: Tuple[str, ...] = ('.',)
+        # Brightness-scaled palette and its (pulse step, accent step, emoji) key, see _frame_palette
+        self._palette_key: Any = None
+        self._palette: Dict[str, Tuple[int, int, int]] = {}
+        # (layout, shown colors, frame) of the last tuple frame, see generate_frame
+        self._frame_memo: Tuple[Any, List[Any], List[Tuple[int, int, int]]] = (None, [], [])
+        # Layout-specialized scatter functions (tuple frames, packed frames)
+        self._draw = self._draw_bytes = _compile_scatter([], False)
+
     def get_parameter_schema(self) -> Dict[str, Dict[str, Any]]:
         schema = super().get_parameter_schema()
         schema.update({
@@ -486,32 +530,88 @@ class EmojiAnimation(AnimationBase):
         return schema
 
     def generate_frame(self, time_elapsed: float, frame_count: int) -> List[Tuple[int, int, int]]:
-        strip_count, leds_per_strip = self.get_strip_info()
-        total_pixels = self.get_pixel_count()
+        palette = self._frame_palette(time_elapsed)
 
-        pattern_name = str(self.params.get('emoji', 'smile')).lower()
-        base_pattern = self.EMOJI_PATTERNS.get(pattern_name, self.EMOJI_PATTERNS['smile'])
+        # Slow or stopped pulses often leave every shown color on the same
+        # 8-bit value as last frame; the frame is then unchanged too
+        layout = self._layout
+        shown = list(map(palette.get, self._layout_cells))
+        memo_layout, memo_shown, memo_frame = self._frame_memo
+        if layout is memo_layout and shown == memo_shown:
+            return memo_frame
 
-        pattern = self._fit_pattern_to_grid(base_pattern, strip_count, leds_per_strip)
-        pattern_height = len(pattern)
-        pattern_width = len(pattern[0]) if pattern else 0
+        # Pre-fill with the background color, then scatter each cell's color
+        pixel_colors = [palette['.']] * self.get_pixel_count()
+        self._draw(pixel_colors, palette)
 
-        # Pre-fill with the background color
-        background = self.apply_brightness(self._color_from_params('background', (2, 6, 12)))
-        pixel_colors = [background] * total_pixels
+        self._frame_memo = (layout, shown, pixel_colors)
+        return pixel_colors
 
-        if not pattern:
-            return pixel_colors
+    def generate_frame_bytes(self, time_elapsed: float, frame_count: int) -> bytearray:
+        """Same frame as generate_frame, scattered straight into the packed byte buffer"""
+        palette = self._frame_palette(time_elapsed)
 
-        palette = self._build_palette(time_elapsed, pattern_name)
-        serpentine = bool(self.params.get('serpentine', False))
+        frame = self.get_byte_buffer()
+        frame[:] = bytes(palette['.']) * self.get_pixel_count()
+        self._draw_bytes(frame, palette)
 
+        return frame
+
+    def _frame_palette(self, time_elapsed: float) -> Dict[str, Tuple[int, int, int]]:
+        """Brightness-scaled palette for this frame, after bringing the layout and draw functions up to date"""
+        strip_count, leds_per_strip = self.get_strip_info()
+        pattern_name = str(self.params.get('emoji', 'smile')).lower()
+        self._pixel_layout(strip_count, leds_per_strip, pattern_name)
+
+        # Consecutive frames usually land on the same pulse steps, so the
+        # palette is only rebuilt when a step (or a parameter) changes
+        pulse_speed = max(0.0, float(self.params.get('pulse_speed', 0.8)))
+        pulse = (math.sin(time_elapsed * pulse_speed * 2 * math.pi) + 1.0) / 2.0
+        accent_wave = (math.sin(time_elapsed * (pulse_speed * 1.5 + 0.3) * 2 * math.pi + 1.1) + 1.0) / 2.0
+        steps = self.PULSE_STEPS
+        key = (round(pulse * steps), round(accent_wave * steps), pattern_name)
+        if key != self._palette_key:
+            # Scale the handful of palette colors once instead of every lit pixel
+            apply_brightness = self.apply_brightness
+            self._palette = {
+                cell: apply_brightness(color)
+                for cell, color in self._build_palette(key[0] / steps, key[1] / steps, pattern_name).items()
+            }
+            self._palette_key = key
+        return self._palette
+
+    def _sync_hot_params(self):
+        """Also drop the cached palettes; they are rebuilt from the new colors and brightness"""
+        super()._sync_hot_params()
+        self._palette_key = None
+        self._palette_base = None
+
+    def _pixel_layout(self, strip_count: int, leds_per_strip: int, pattern_name: str) -> List[Tuple[str, List[int]]]:
+        """
+        Pixel indices of every non-background cell, grouped by cell character
+
+        Fitting the pattern and mapping it onto the (optionally serpentine)
+        grid only depends on the grid size, emoji, offsets and wiring, so it
+        is redone (and the draw functions recompiled) only when one of those
+        changes.
+        """
+        serpentine = bool(self.params.get('serpentine', False))
         x_offset = int(self.params.get('x_offset', 0))
         y_offset = int(self.params.get('y_offset', 0))
 
+        key = (strip_count, leds_per_strip, pattern_name, x_offset, y_offset, serpentine)
+        if key == self._layout_key:
+            return self._layout
+
+        base_pattern = self.EMOJI_PATTERNS.get(pattern_name, self.EMOJI_PATTERNS['smile'])
+        pattern = self._fit_pattern_to_grid(base_pattern, strip_count, leds_per_strip)
+        pattern_height = len(pattern)
+        pattern_width = len(pattern[0]) if pattern else 0
+
         start_strip = max(0, min(strip_count - pattern_height, (strip_count - pattern_height) // 2 + y_offset))
         start_led = max(0, min(leds_per_strip - pattern_width, (leds_per_strip - pattern_width) // 2 + x_offset))
 
+        cells: Dict[str, List[int]] = {}
         for row_idx, row in enumerate(pattern):
             strip = start_strip + row_idx
             if strip >= strip_count:
@@ -521,30 +621,24 @@ class EmojiAnimation(AnimationBase):
                 led = start_led + col_idx
                 if led >= leds_per_strip:
                     break
-
-                color = palette.get(cell)
-                if color is None:
+                if cell == '.':
                     continue
 
                 mapped_led = led if not (serpentine and strip % 2 == 1) else (leds_per_strip - 1 - led)
-                pixel_index = strip * leds_per_strip + mapped_led
-                pixel_colors[pixel_index] = self.apply_brightness(color)
+                cells.setdefault(cell, []).append(strip * leds_per_strip + mapped_led)
 
-        return pixel_colors
-
-    def _build_palette(self, time_elapsed: float, emoji_name: str) -> Dict[str, Tuple[int, int, int]]:
-        pulse_speed = max(0.0, float(self.params.get('pulse_speed', 0.8)))
-        pulse = (math.sin(time_elapsed * pulse_speed * 2 * math.pi) + 1.0) / 2.0
-        accent_wave = (math.sin(time_elapsed * (pulse_speed * 1.5 + 0.3) * 2 * math.pi + 1.1) + 1.0) / 2.0
+        self._layout_key = key
+        self._layout = list(cells.items())
+        self._layout_cells = ('.',) + tuple(cells)
+        self._draw = _compile_scatter(self._layout, False)
+        self._draw_bytes = _compile_scatter(self._layout, True)
+        return self._layout
 
-        primary = self._color_from_params('primary', (255, 200, 40))
-        accent = self._color_from_params('accent', (235, 60, 70))
-        background = self._color_from_params('background', (2, 6, 12))
+    def _build_palette(self, pulse: float, accent_wave: float, emoji_name: str) -> Dict[str, Tuple[int, int, int]]:
+        primary, accent, background, highlight_base, mouth_base = self._base_palette()
 
         face = self._scale_color(primary, 0.8 + 0.25 * pulse)
-        highlight = self._mix_colors(primary, accent, 0.25)
-        highlight = self._scale_color(highlight, 0.9 + 0.25 * accent_wave)
-        mouth_base = self._mix_colors(accent, (90, 40, 20), 0.35)
+        highlight = self._scale_color(highlight_base, 0.9 + 0.25 * accent_wave)
         mouth = self._scale_color(mouth_base, 0.8 + 0.2 * pulse)
         eye = (20, 20, 20)
 
@@ -563,6 +657,22 @@ class EmojiAnimation(AnimationBase):
 
         return color_map
 
+    def _base_palette(self) -> Tuple[Tuple[int, int, int], ...]:
+        """(primary, accent, background, highlight, mouth) before pulsing; only depends on params"""
+        base = self._palette_base
+        if base is None:
+            primary = self._color_from_params('primary', (255, 200, 40))
+            accent = self._color_from_params('accent', (235, 60, 70))
+            background = self._color_from_params('background', (2, 6, 12))
+            base = self._palette_base = (
+                primary,
+                accent,
+                background,
+                self._mix_colors(primary, accent, 0.25),
+                self._mix_colors(accent, (90, 40, 20), 0.35),
+            )
+        return base
+
     def _color_from_params(self, prefix: str, default: Tuple[int, int, int]) -> Tuple[int, int, int]:
         r = int(self.params.get(f'{prefix}_red', default[0]))
         g = int(self.params.get(f'{prefix}_green', default[1]))
@@ -581,12 +691,7 @@ class EmojiAnimation(AnimationBase):
         )
 
     def _mix_colors(self, base: Tuple[int, int, int], overlay: Tuple[int, int, int], mix: float) -> Tuple[int, int, int]:
-        mix = max(0.0, min(1.0, mix))
-        return (
-            int(base[0] * (1 - mix) + overlay[0] * mix),
-            int(base[1] * (1 - mix) + overlay[1] * mix),
-            int(base[2] * (1 - mix) + overlay[2] * mix)
-        )
+        return mix_linear(base, overlay, max(0.0, min(1.0, mix)))
 
     def _fit_pattern_to_grid(self, pattern: List[str], max_height: int, max_width: int) -> List[str]:
         if not pattern:
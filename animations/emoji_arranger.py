@@ -9,7 +9,7 @@ Supports all emojis, letters A-Z, and numbers 0-9 from the emoji animation patte
 import math
 from typing import Any, Dict, List, Tuple
 
-from animation_system.animation_base import AnimationBase
+from animation_system.animation_base import AnimationBase, mix_linear
 
 
 class EmojiArrangerAnimation(AnimationBase):
@@ -282,10 +282,5 @@ class EmojiArrangerAnimation(AnimationBase):
         )
 
     def _mix_colors(self, base: Tuple[int, int, int], overlay: Tuple[int, int, int], mix: float) -> Tuple[int, int, int]:
-        """Mix two colors"""
-        mix = max(0.0, min(1.0, mix))
-        return (
-            int(base[0] * (1 - mix) + overlay[0] * mix),
-            int(base[1] * (1 - mix) + overlay[1] * mix),
-            int(base[2] * (1 - mix) + overlay[2] * mix)
-        )
+        """Mix two colors in linear light"""
+        return mix_linear(base, overlay, max(0.0, min(1.0, mix)))
@@ -97,6 +97,16 @@ class FlameBurstAnimation(AnimationBase):
         return schema
 
     def generate_frame(self, time_elapsed: float, frame_count: int) -> List[Tuple[int, int, int]]:
+        return self._render_into(time_elapsed, self.get_frame_buffer())
+
+    def generate_frame_into(self, time_elapsed: float, frame_count: int,
+                            out: List[Tuple[int, int, int]]) -> None:
+        """Write every pixel straight into the animation loop's buffer"""
+        self._render_into(time_elapsed, out)
+
+    def _render_into(self, time_elapsed: float,
+                     pixel_colors: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """Render one frame into ``pixel_colors`` (one entry per pixel) and return it"""
         strip_count, leds_per_strip = self.get_strip_info()
         visible_leds = max(1, min(int(self.params.get('visible_leds', leds_per_strip)), leds_per_strip))
 
@@ -128,7 +138,7 @@ class FlameBurstAnimation(AnimationBase):
         radius = phase                     # Normalized radius across the grid
         envelope = math.sin(phase * math.pi)  # Ease in/out for each burst
 
-        pixel_colors = []
+        index = 0
 
         for strip in range(strip_count):
             for led in range(leds_per_strip):
@@ -160,6 +170,7 @@ class FlameBurstAnimation(AnimationBase):
 
                 color = self.hsv_to_rgb(hue, min(saturation, 1.0), min(value, 1.0))
                 color = self.apply_brightness(color)
-                pixel_colors.append(color)
+                pixel_colors[index] = color
+                index += 1
 
         return pixel_colors
@@ -52,11 +52,12 @@ class LEDControllerSPIAnimation(StatefulAnimationBase):
 
         # Create pixel buffer - exactly like the working version
         pixel_buffer = [(0, 0, 0)] * self.controller.total_leds
+        stop_requested = self.stop_event.is_set
 
         # Test each strip - exactly like the working version
         for strip in range(self.controller.strip_count):
             # Check if we should stop
-            if self.stop_event.is_set():
+            if stop_requested():
                 print(f"🛑 Animation stopped at strip {strip}")
                 break
 
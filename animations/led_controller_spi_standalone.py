@@ -112,12 +112,13 @@ class LEDControllerSPIAnimation(StatefulAnimationBase):
             ]
 
             pixel_buffer = [(0, 0, 0)] * self.controller.total_leds
+            stop_requested = self.stop_event.is_set
 
             # Continuous loop like the working version
-            while not self.stop_event.is_set():
+            while not stop_requested():
                 for strip in range(self.controller.strip_count):
                     # Check for stop request
-                    if self.stop_event.is_set():
+                    if stop_requested():
                         break
 
                     if self.controller.debug:
@@ -59,17 +59,33 @@ class RainbowAnimation(AnimationBase):
         })
         return schema
     
+    def reset(self):
+        """Restart the cycle from the first hue"""
+        self.hue_offset = 0.0
+
     def generate_frame(self, time_elapsed: float, frame_count: int) -> List[Tuple[int, int, int]]:
         """Generate rainbow frame"""
+        strip_count, _ = self.get_strip_info()
+        return self._strip_colors() * strip_count
+
+    def generate_frame_into(self, time_elapsed: float, frame_count: int,
+                            out: List[Tuple[int, int, int]]) -> None:
+        """Render the rainbow straight into the animation loop's frame buffer"""
         strip_count, leds_per_strip = self.get_strip_info()
-        total_pixels = self.get_pixel_count()
+        strip = self._strip_colors()
+        for start in range(0, strip_count * leds_per_strip, leds_per_strip):
+            out[start:start + leds_per_strip] = strip
+
+    def _strip_colors(self) -> List[Tuple[int, int, int]]:
+        """Advance the hue and compute one strip's colors (every strip is identical)"""
+        _, leds_per_strip = self.get_strip_info()
         
         # Calculate animation parameters
-        speed = self.params.get('speed', 0.3)
+        speed = self._speed
         span_ratio = self.params.get('span_ratio', 1.0)
         direction = self.params.get('direction', 1)
-        saturation = self.params.get('color_saturation', 1.0)
-        value = self.params.get('color_value', 1.0)
+        saturation = self._color_saturation
+        value = self._color_value
         
         # Calculate span in pixels
         span_pixels = max(int(leds_per_strip * span_ratio), 1)
@@ -82,23 +98,10 @@ class RainbowAnimation(AnimationBase):
         elif self.hue_offset < 0.0:
             self.hue_offset += 1.0
         
-        # Generate colors for all pixels
-        pixel_colors = []
-        
-        for strip in range(strip_count):
-            for led in range(leds_per_strip):
-                # Calculate hue based on position within the span
-                hue = (self.hue_offset + (led / span_pixels)) % 1.0
-                
-                # Convert HSV to RGB
-                color = self.hsv_to_rgb(hue, saturation, value)
-                
-                # Apply brightness
-                color = self.apply_brightness(color)
-                
-                pixel_colors.append(color)
-        
-        return pixel_colors
+        # Hue depends only on the position within a strip
+        hue_offset = self.hue_offset
+        hues = [(hue_offset + (led / span_pixels)) % 1.0 for led in range(leds_per_strip)]
+        return self.compose_frame(hues, saturation, value)
 
 
 class RainbowWaveAnimation(AnimationBase):
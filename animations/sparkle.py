@@ -6,9 +6,85 @@ Keeps only the sparkle effect from the previous effects collection so it can
 stand alone as a single plugin.
 """
 
+import math
 import random
-from typing import List, Tuple, Dict, Any
-from animation_system import AnimationBase
+from itertools import chain
+from typing import Callable, List, Tuple, Dict, Any
+from animation_system import AnimationBase, mix_linear
+
+Color = Tuple[int, int, int]
+
+def _spawn_indices(total: int, prob: float) -> List[int]:
+    """
+    Indices of the pixels that sparkle this frame, each with probability ``prob``
+
+    Instead of one random draw per pixel, each draw gives the (geometrically
+    distributed) gap to the next sparkling pixel, so a frame costs about
+    ``total * prob`` draws.
+    """
+    if prob <= 0.0:
+        return []
+    if prob >= 1.0:
+        return list(range(total))
+
+    rand = random.random
+    log = math.log
+    log_miss = log(1.0 - prob)
+    indices = []
+    index = int(log(1.0 - rand()) / log_miss)
+    while index < total:
+        indices.append(index)
+        index += 1 + int(log(1.0 - rand()) / log_miss)
+    return indices
+
+
+def _sparkle_step(levels: Dict[int, float], frame: List[Color], spawned: List[int], fade_speed: float,
+                  colors: Dict[float, Color], level_color: Callable[[float], Color], base: Color) -> Dict[int, float]:
+    """
+    Advance the lit pixels by one frame and write their colors into ``frame``
+
+    ``frame`` arrives filled with the ``base`` color and ``levels`` maps pixel
+    index to level for the pixels still lit. In a single pass each one fades
+    and has its color looked up in ``colors`` (``level_color`` fills misses);
+    it is written if it still differs from the base, and dropped once it
+    renders as the base color, which it then does at every lower level. The
+    ``spawned`` pixels (from ``_spawn_indices``) then restart at full level.
+    Returns the new levels.
+    """
+    faded = {}
+    for index, level in levels.items():
+        level *= fade_speed
+        color = colors.get(level) or level_color(level)
+        if color != base:
+            faded[index] = level
+            frame[index] = color
+    if spawned:
+        full = level_color(1.0)
+        for index in spawned:
+            faded[index] = 1.0
+            frame[index] = full
+    return faded
+
+
+def _sparkle_step_packed(levels: Dict[int, float], frame: bytearray, spawned: List[int], fade_speed: float,
+                         colors: Dict[float, bytes], level_color: Callable[[float], bytes],
+                         base: bytes) -> Dict[int, float]:
+    """``_sparkle_step`` for a packed R, G, B frame: colors are 3-byte strings written as slices"""
+    faded = {}
+    for index, level in levels.items():
+        level *= fade_speed
+        color = colors.get(level) or level_color(level)
+        if color != base:
+            faded[index] = level
+            start = 3 * index
+            frame[start:start + 3] = color
+    if spawned:
+        full = level_color(1.0)
+        for index in spawned:
+            faded[index] = 1.0
+            start = 3 * index
+            frame[start:start + 3] = full
+    return faded
 
 
 class SparkleAnimation(AnimationBase):
@@ -35,9 +111,10 @@ class SparkleAnimation(AnimationBase):
 
         self.params = {**self.default_params, **self.config}
 
-        # Initialize sparkle state
-        total_pixels = self.get_pixel_count()
-        self.sparkle_brightness = [0.0] * total_pixels
+        # Initialize sparkle state: pixel index -> level for the pixels that
+        # still render differently from the base color
+        self.total_pixels = self.get_pixel_count()
+        self.sparkle_levels: Dict[int, float] = {}
 
     def get_parameter_schema(self) -> Dict[str, Dict[str, Any]]:
         schema = super().get_parameter_schema()
@@ -53,45 +130,67 @@ class SparkleAnimation(AnimationBase):
         })
         return schema
 
+    def _sync_hot_params(self):
+        """Also mirror the sparkle colors and rates so frames skip the params lookups"""
+        super()._sync_hot_params()
+        params = self._params
+        self._base_color = (
+            params.get('base_red', 0),
+            params.get('base_green', 0),
+            params.get('base_blue', 20),
+        )
+        self._sparkle_color = (
+            params.get('sparkle_red', 255),
+            params.get('sparkle_green', 255),
+            params.get('sparkle_blue', 255),
+        )
+        self._sparkle_prob = params.get('sparkle_probability', 0.02)
+        self._fade_speed = params.get('fade_speed', 0.9)
+        # Faded levels repeat frame after frame (1.0 * fade ** age), so their
+        # colors are kept until the colors or brightness change
+        self._level_colors: Dict[float, Color] = {}
+        self._level_bytes: Dict[float, bytes] = {}
+
     def generate_frame(self, time_elapsed: float, frame_count: int) -> List[Tuple[int, int, int]]:
         """Generate sparkle frame"""
-        total_pixels = self.get_pixel_count()
-
-        base_color = (
-            self.params.get('base_red', 0),
-            self.params.get('base_green', 0),
-            self.params.get('base_blue', 20),
+        spawned = _spawn_indices(self.total_pixels, self._sparkle_prob)
+        base = self._level_color(0.0)
+        frame = [base] * self.total_pixels
+        self.sparkle_levels = _sparkle_step(
+            self.sparkle_levels, frame, spawned, self._fade_speed,
+            self._level_colors, self._level_color, base,
         )
-
-        sparkle_color = (
-            self.params.get('sparkle_red', 255),
-            self.params.get('sparkle_green', 255),
-            self.params.get('sparkle_blue', 255),
+        return frame
+
+    def generate_frame_bytes(self, time_elapsed: float, frame_count: int) -> bytearray:
+        """Fill the byte buffer with the base color and write the lit pixels straight into it"""
+        if 4 * len(self.sparkle_levels) > self.total_pixels:
+            # With most pixels lit, a 3-byte slice write per pixel costs more
+            # than packing the tuple frame (a few shared color tuples) in C
+            return bytearray(chain.from_iterable(self.generate_frame(time_elapsed, frame_count)))
+
+        spawned = _spawn_indices(self.total_pixels, self._sparkle_prob)
+        base = self._level_packed(0.0)
+        frame = self.get_byte_buffer()
+        frame[:] = base * self.total_pixels
+        self.sparkle_levels = _sparkle_step_packed(
+            self.sparkle_levels, frame, spawned, self._fade_speed,
+            self._level_bytes, self._level_packed, base,
         )
-
-        sparkle_prob = self.params.get('sparkle_probability', 0.02)
-        fade_speed = self.params.get('fade_speed', 0.9)
-
-        # Update sparkle state
-        for i in range(total_pixels):
-            # Fade existing sparkles
-            self.sparkle_brightness[i] *= fade_speed
-
-            # Add new sparkles randomly
-            if random.random() < sparkle_prob:
-                self.sparkle_brightness[i] = 1.0
-
-        # Generate colors
-        pixel_colors = []
-        for i in range(total_pixels):
-            brightness = self.sparkle_brightness[i]
-
-            # Interpolate between base and sparkle color
-            r = int(base_color[0] * (1 - brightness) + sparkle_color[0] * brightness)
-            g = int(base_color[1] * (1 - brightness) + sparkle_color[1] * brightness)
-            b = int(base_color[2] * (1 - brightness) + sparkle_color[2] * brightness)
-
-            color = self.apply_brightness((r, g, b))
-            pixel_colors.append(color)
-
-        return pixel_colors
+        return frame
+
+    def _level_color(self, level: float) -> Color:
+        """Base-to-sparkle blend (in linear light) at ``level``, with brightness applied"""
+        color = self._level_colors.get(level)
+        if color is None:
+            color = self._level_colors[level] = self.apply_brightness(
+                mix_linear(self._base_color, self._sparkle_color, level)
+            )
+        return color
+
+    def _level_packed(self, level: float) -> bytes:
+        """``_level_color`` packed as 3 R, G, B bytes"""
+        packed = self._level_bytes.get(level)
+        if packed is None:
+            packed = self._level_bytes[level] = bytes(self._level_color(level))
+        return packed
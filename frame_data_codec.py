@@ -12,11 +12,22 @@ from __future__ import annotations
 
 import base64
 import json
+import sys
 import zlib
-from typing import Any, List
+from array import array
+from itertools import chain
+from typing import Any, List, Sequence, Tuple
 
 FRAME_ENCODING_NAME = "json-zlib-base64"
 
+# Frames may also arrive already packed as flat R, G, B bytes
+PACKED_FRAME_TYPES = (bytes, bytearray, memoryview)
+
+# ...or as one 32-bit word per pixel (0x00RRGGBB) in an array of this typecode
+U32_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+# Byte offsets of R, G and B inside each word in native byte order
+_U32_RGB_OFFSETS = (2, 1, 0) if sys.byteorder == "little" else (1, 2, 3)
+
 
 def encode_frame_data(frame_data: List[Any]) -> str:
     """
@@ -57,3 +68,93 @@ def decode_frame_data(encoded: str) -> List[Any]:
     except Exception:
         # Bad payloads should not crash the UI; treat them as empty.
         return []
+
+
+def pack_frame_rgb(frame_data: Sequence[Any], total_pixels: int) -> bytearray:
+    """
+    Pack a frame (list of RGB tuples) into the flat R, G, B byte layout the
+    LED controllers transmit.
+
+    Args:
+        frame_data: List of RGB tuples/lists, an already packed bytes-like
+            frame (copied through as-is), or a uint32 pixel array.
+        total_pixels: Pixel count of the output; short frames are padded with
+            black and long ones truncated.
+
+    Returns:
+        bytearray of exactly ``3 * total_pixels`` bytes.
+    """
+    if isinstance(frame_data, array):
+        return pack_frame_u32(frame_data, total_pixels)
+    if isinstance(frame_data, PACKED_FRAME_TYPES):
+        size = 3 * total_pixels
+        packed = bytearray(frame_data[:size])
+        if len(packed) < size:
+            packed.extend(bytes(size - len(packed)))
+        return packed
+
+    count = min(len(frame_data), total_pixels)
+    pixels = frame_data if count == len(frame_data) else frame_data[:count]
+    try:
+        # Fast path: in-range integer channels pack entirely in C
+        packed = bytearray(chain.from_iterable(pixels))
+    except (TypeError, ValueError):
+        # Float or out-of-range channels: truncate and mask like the SPI layer always has
+        packed = bytearray(int(channel) & 0xFF for color in pixels for channel in color)
+    if count < total_pixels:
+        packed.extend(bytes(3 * (total_pixels - count)))
+    return packed
+
+
+def unpack_frame_rgb(packed: Sequence[int]) -> List[Tuple[int, int, int]]:
+    """
+    Split a packed R, G, B byte frame back into a list of RGB tuples.
+
+    Args:
+        packed: Flat bytes-like frame as produced by pack_frame_rgb. A trailing
+            partial pixel is dropped.
+
+    Returns:
+        List of (r, g, b) int tuples.
+    """
+    channels = iter(packed)
+    return list(zip(channels, channels, channels))
+
+
+def frame_to_u32(frame_data: Sequence[Any]) -> array:
+    """
+    Pack a frame of RGB tuples into one 0x00RRGGBB word per pixel.
+
+    Args:
+        frame_data: List of RGB tuples with 0-255 int channels.
+
+    Returns:
+        array of U32_TYPECODE with one entry per pixel.
+    """
+    return array(U32_TYPECODE, [(r << 16) | (g << 8) | b for r, g, b in frame_data])
+
+
+def pack_frame_u32(pixels: array, total_pixels: int) -> bytearray:
+    """
+    Convert a uint32 pixel array into the flat R, G, B byte layout.
+
+    Each channel is moved with one strided slice copy over the array's raw
+    bytes, so no per-pixel Python work is done.
+
+    Args:
+        pixels: array of U32_TYPECODE holding 0x00RRGGBB words.
+        total_pixels: Pixel count of the output; short frames are padded with
+            black and long ones truncated.
+
+    Returns:
+        bytearray of exactly ``3 * total_pixels`` bytes.
+    """
+    count = min(len(pixels), total_pixels)
+    words = (pixels if count == len(pixels) else pixels[:count]).tobytes()
+    packed = bytearray(3 * total_pixels)
+    end = 3 * count
+    r, g, b = _U32_RGB_OFFSETS
+    packed[0:end:3] = words[r::4]
+    packed[1:end:3] = words[g::4]
+    packed[2:end:3] = words[b::4]
+    return packed
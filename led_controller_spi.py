@@ -11,6 +11,7 @@ import spidev
 import sys
 
 from led_layout import DEFAULT_STRIP_COUNT, DEFAULT_LEDS_PER_STRIP
+from frame_data_codec import pack_frame_rgb
 
 # LED Configuration defaults
 DEFAULT_LED_PER_STRIP = DEFAULT_LEDS_PER_STRIP
@@ -235,22 +236,26 @@ class LEDController:
 
     def set_all_pixels(self, colors):
         """Send all pixels in one SPI transaction"""
+        if not isinstance(colors, (list, tuple)):
+            colors = list(colors)
+        self.set_all_pixels_bytes(pack_frame_rgb(colors, self.total_leds))
+
+    def set_all_pixels_bytes(self, rgb):
+        """
+        Send a prepacked frame (3 bytes per pixel, R G B) to all pixels
+
+        Short buffers are padded with black and long ones truncated.
+        """
         self._refresh_configuration()
 
         total_pixels = self.total_leds
-        base_colors = list(colors)
-
-        if len(base_colors) < total_pixels:
-            frame_colors = base_colors + [(0, 0, 0)] * (total_pixels - len(base_colors))
-        elif len(base_colors) > total_pixels:
-            frame_colors = base_colors[:total_pixels]
-        else:
-            frame_colors = base_colors
+        total_bytes = 3 * total_pixels
+        if len(rgb) < total_bytes:
+            rgb = bytes(rgb) + bytes(total_bytes - len(rgb))
 
         if total_pixels <= MAX_PIXELS_SET_ALL:
-            data = [CMD_SET_ALL]
-            for r, g, b in frame_colors:
-                data.extend([int(r) & 0xFF, int(g) & 0xFF, int(b) & 0xFF])
+            data = bytearray([CMD_SET_ALL])
+            data += rgb[:total_bytes]
             self._xfer(data)
             # Inter-frame delay if configured (0 = no delay)
             if SPI_INTER_FRAME_DELAY > 0:
@@ -260,14 +265,13 @@ class LEDController:
             start = 0
             while start < total_pixels:
                 count = min(MAX_PIXELS_PER_RANGE, total_pixels - start)
-                payload = [
+                payload = bytearray([
                     CMD_SET_RANGE,
                     (start >> 8) & 0xFF,
                     start & 0xFF,
                     count
-                ]
-                for r, g, b in frame_colors[start:start + count]:
-                    payload.extend([int(r) & 0xFF, int(g) & 0xFF, int(b) & 0xFF])
+                ])
+                payload += rgb[3 * start:3 * (start + count)]
                 self._xfer(payload)
                 start += count
 
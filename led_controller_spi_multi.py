@@ -7,6 +7,7 @@ Controls multiple ESP32 devices via SPI with different CS pins
 import threading
 from typing import List, Tuple
 from led_controller_spi import LEDController, SPI_BUS, SPI_SPEED, SPI_MODE
+from frame_data_codec import pack_frame_rgb
 
 
 class MultiDeviceLEDController:
@@ -78,47 +79,10 @@ class MultiDeviceLEDController:
         if self.debug:
             print(f"\n✓ All {num_devices} devices initialized\n")
     
-    def _split_frame(self, colors: List[Tuple[int, int, int]]) -> List[List[Tuple[int, int, int]]]:
-        """
-        Split full frame into per-device chunks
-        
-        Args:
-            colors: Full frame of (r,g,b) tuples for all pixels
-            
-        Returns:
-            List of color lists, one per device
-        """
-        device_frames = []
-        
-        for device_id in range(self.num_devices):
-            device_colors = []
-            
-            # Each device gets consecutive strips
-            for local_strip in range(self.strips_per_device):
-                global_strip = device_id * self.strips_per_device + local_strip
-                start_idx = global_strip * self.leds_per_strip
-                end_idx = start_idx + self.leds_per_strip
-                
-                # Extract this strip's pixels
-                if start_idx < len(colors):
-                    strip_pixels = colors[start_idx:end_idx]
-                else:
-                    strip_pixels = []
-                
-                # Pad if needed
-                if len(strip_pixels) < self.leds_per_strip:
-                    strip_pixels.extend([(0, 0, 0)] * (self.leds_per_strip - len(strip_pixels)))
-                
-                device_colors.extend(strip_pixels[:self.leds_per_strip])
-            
-            device_frames.append(device_colors)
-        
-        return device_frames
-    
-    def _send_to_device(self, device_id: int, colors: List[Tuple[int, int, int]]):
-        """Send frame data to a specific device"""
+    def _send_to_device(self, device_id: int, rgb: bytes):
+        """Send a packed frame slice (3 bytes per pixel) to a specific device"""
         try:
-            self.devices[device_id].set_all_pixels(colors)
+            self.devices[device_id].set_all_pixels_bytes(rgb)
         except Exception as e:
             if self.debug:
                 print(f"✗ Error sending to device {device_id}: {e}")
@@ -130,16 +94,32 @@ class MultiDeviceLEDController:
         Args:
             colors: List of (r,g,b) tuples for entire grid
         """
-        # Split frame into per-device chunks
-        device_frames = self._split_frame(colors)
+        if not isinstance(colors, (list, tuple)):
+            colors = list(colors)
+        self.set_all_pixels_bytes(pack_frame_rgb(colors, self.total_leds))
+
+    def set_all_pixels_bytes(self, rgb: bytes):
+        """
+        Set all pixels across all devices from a prepacked frame
+
+        Args:
+            rgb: 3 bytes (R, G, B) per pixel for the entire grid
+        """
+        # Devices own consecutive strips, so each one's pixels are a
+        # contiguous slice of the packed frame
+        device_bytes = 3 * self.leds_per_device
+        device_frames = [
+            rgb[device_id * device_bytes:(device_id + 1) * device_bytes]
+            for device_id in range(self.num_devices)
+        ]
         
         if self.parallel and self.num_devices > 1:
             # Send to all devices in parallel using threads
             threads = []
-            for device_id, device_colors in enumerate(device_frames):
+            for device_id, device_rgb in enumerate(device_frames):
                 thread = threading.Thread(
                     target=self._send_to_device,
-                    args=(device_id, device_colors),
+                    args=(device_id, device_rgb),
                     daemon=True
                 )
                 thread.start()
@@ -150,8 +130,8 @@ class MultiDeviceLEDController:
                 thread.join(timeout=1.0)
         else:
             # Send to devices sequentially
-            for device_id, device_colors in enumerate(device_frames):
-                self._send_to_device(device_id, device_colors)
+            for device_id, device_rgb in enumerate(device_frames):
+                self._send_to_device(device_id, device_rgb)
     
     def set_pixel(self, pixel: int, r: int, g: int, b: int):
         """Set a single pixel color"""
@@ -14,39 +14,11 @@ from pathlib import Path
 # Add current directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from animation_manager import AnimationManager
+from animation_manager import AnimationManager, LEDController
 from control_channel import FileControlChannel
 from led_layout import DEFAULT_STRIP_COUNT, DEFAULT_LEDS_PER_STRIP
 from web_interface import create_app
 
-# Try to import the real LED controller, fall back to mock for testing
-try:
-    from led_controller_spi_multi import MultiDeviceLEDController as LEDController
-except ImportError:
-    try:
-        from led_controller_spi import LEDController
-    except ImportError:
-        class LEDController:
-            def __init__(self, strips=DEFAULT_STRIP_COUNT, leds_per_strip=DEFAULT_LEDS_PER_STRIP, **kwargs):
-                self.strip_count = strips
-                self.leds_per_strip = leds_per_strip
-                self.total_leds = strips * leds_per_strip
-                self.debug = kwargs.get('debug', False)
-                self.inline_show = True
-                print(f"🔧 Mock LED Controller: {strips} strips × {leds_per_strip} LEDs = {self.total_leds} total")
-
-            def set_all_pixels(self, *_args, **_kwargs):
-                pass
-
-            def show(self):
-                pass
-
-            def clear(self):
-                pass
-
-            def configure(self):
-                pass
-
 
 def run_controller_mode(args):
     """Controller process: drives LEDs and writes status/frames to disk."""
@@ -81,6 +53,10 @@ def run_controller_mode(args):
         controller,
         plugins_dir=args.animations_dir,
         animation_speed_scale=args.animation_speed_scale,
+        cpu_pin=args.animation_cpu,
+        realtime_priority=args.realtime_priority,
+        # The controller only ever starts animations by name, so import lazily
+        preload_plugins=False,
     )
     manager.target_fps = args.target_fps
 
@@ -220,6 +196,10 @@ def main():
                         help='Target animation FPS (default: 40)')
     parser.add_argument('--animation-speed-scale', type=float, default=0.2,
                         help='Multiplier applied to each animation\'s speed parameter (default: 0.2)')
+    parser.add_argument('--animation-cpu', type=int, default=None,
+                        help='Pin the animation thread to this CPU core (Linux, default: unpinned)')
+    parser.add_argument('--realtime-priority', type=int, default=0,
+                        help='SCHED_RR priority for the animation thread; 0 disables (default: 0)')
     parser.add_argument('--poll-interval', type=float, default=0.5,
                         help='Seconds between control-file polls (controller mode)')
     parser.add_argument('--status-interval', type=float, default=0.5,
@@ -0,0 +1,1144 @@
+"""AnimationManager frame pipeline tests using the no-I/O preview controller."""
+
+import colorsys
+import hashlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import animation_manager
+from frame_data_codec import decode_frame_data, pack_frame_rgb
+from animation_manager import AnimationManager, PreviewLEDController
+from animation_system import AnimationBase, AnimationPluginLoader, StatefulAnimationBase, black_frame, mix_linear
+from animation_system.animation_base import GAMMA_LUT, HUE_LUT, _hsv_run, hsv_to_rgb255
+
+
+class AnimationManagerFrameTests(unittest.TestCase):
+    def setUp(self):
+        self.controller = PreviewLEDController(strips=2, leds_per_strip=4)
+        self.manager = AnimationManager(self.controller, plugins_dir="animations")
+
+    def test_normalize_pads_and_truncates(self):
+        short = self.manager._normalize_frame([(1, 2, 3)])
+        self.assertEqual(len(short), 8)
+        self.assertEqual(short[0], (1, 2, 3))
+        self.assertEqual(short[-1], (0, 0, 0))
+
+        long = self.manager._normalize_frame([(9, 9, 9)] * 20)
+        self.assertEqual(long, [(9, 9, 9)] * 8)
+
+        self.assertEqual(self.manager._normalize_frame(None), [(0, 0, 0)] * 8)
+
+        exact = [(4, 4, 4)] * 8
+        self.assertIs(self.manager._normalize_frame(exact), exact)
+
+    def test_normalize_reuses_output_buffer(self):
+        buffer = self.manager._frame_buffers[0]
+        frame = self.manager._normalize_frame([(5, 5, 5)] * 8, out=buffer)
+        self.assertIs(frame, buffer)
+        self.assertEqual(frame, [(5, 5, 5)] * 8)
+
+        frame = self.manager._normalize_frame(iter([(7, 7, 7)]), out=buffer)
+        self.assertIs(frame, buffer)
+        self.assertEqual(frame[0], (7, 7, 7))
+        self.assertEqual(frame[1:], [(0, 0, 0)] * 7)
+
+    def test_animation_loop_publishes_frames(self):
+        self.manager.target_fps = 200
+        self.assertTrue(self.manager.start_animation("rainbow"))
+        try:
+            deadline = time.time() + 2.0
+            while time.time() < deadline and (
+                self.manager.frame_count < 5 or not self.manager.current_animation_hash
+            ):
+                time.sleep(0.01)
+            published = self.manager.current_frame_data
+            snapshot = list(published)
+            frame = self.manager.get_current_frame()
+            status = self.manager.get_current_status()
+        finally:
+            self.manager.stop_animation()
+
+        # Publishing is a reference swap between the two preallocated buffers
+        self.assertIsNot(published, snapshot)
+        self.assertTrue(any(published is buffer for buffer in self.manager._frame_buffers))
+        self.assertGreaterEqual(frame['frame_count'], 5)
+        self.assertEqual(frame['frame_data_length'], 8)
+        self.assertTrue(frame['frame_data_encoded'])
+        self.assertEqual(
+            status['animation_hash'], self.manager._compute_animation_hash("rainbow")
+        )
+        self.assertIsNone(self.manager.current_animation_hash)
+
+
+    def test_animation_loop_sends_packed_frames_when_rendered_packed(self):
+        sent = []
+
+        class RecordingController(PreviewLEDController):
+            def set_all_pixels(self, colors):
+                sent.append(('tuples', list(colors)))
+
+            def set_all_pixels_bytes(self, rgb):
+                sent.append(('bytes', rgb))
+
+        controller = RecordingController(strips=2, leds_per_strip=4)
+        self.manager.controller = controller
+        for name, expected_kind in (("rainbow", 'tuples'), ("sparkle", 'bytes')):
+            sent.clear()
+            animation = self.manager.plugin_loader.get_plugin(name)(controller)
+            self.manager.current_animation = animation
+            self.manager.stop_event.clear()
+            timer = threading.Timer(0.2, self.manager.stop_event.set)
+            timer.start()
+            self.manager._animation_loop()
+
+            self.assertTrue(sent)
+            self.assertEqual({kind for kind, _ in sent}, {expected_kind}, name)
+            self.assertEqual(self.manager.get_current_frame()['frame_data_length'], 8)
+
+        # Packed frames are published as immutable snapshots of the animation's buffer
+        self.assertIsInstance(sent[0][1], bytes)
+
+    def test_repeated_loop_errors_are_reported_once(self):
+        animation_class = self.manager.plugin_loader.get_plugin("rainbow")
+        animation = animation_class(self.controller)
+
+        def broken(*_args):
+            raise RuntimeError("boom")
+
+        animation.generate_frame_into = broken
+        self.manager.current_animation = animation
+        self.manager.stop_event.clear()
+        timer = threading.Timer(0.3, self.manager.stop_event.set)
+
+        output = io.StringIO()
+        with redirect_stdout(output), redirect_stderr(output):
+            timer.start()
+            self.manager._animation_loop()
+        text = output.getvalue()
+
+        self.assertEqual(text.count("Animation loop error: boom"), 1)
+        self.assertEqual(text.count("Traceback"), 1)
+        self.assertIn("repeated", text)
+
+    def test_unchanged_frame_is_not_re_encoded(self):
+        encoded = []
+        original = animation_manager.encode_frame_data
+        animation_manager.encode_frame_data = lambda frame: encoded.append(1) or original(frame)
+        try:
+            self.manager.current_frame_data = self.manager._frame_buffers[0]
+            first = self.manager.get_current_frame()
+            second = self.manager.get_current_frame()
+            self.assertEqual(len(encoded), 1)
+            self.assertEqual(second['frame_data_encoded'], first['frame_data_encoded'])
+
+            self.manager.frame_count += 1
+            self.manager.get_current_frame()
+            self.assertEqual(len(encoded), 2)
+        finally:
+            animation_manager.encode_frame_data = original
+
+    def test_stop_interrupts_frame_wait(self):
+        self.manager.target_fps = 1
+        self.assertTrue(self.manager.start_animation("rainbow"))
+        deadline = time.time() + 2.0
+        while time.time() < deadline and self.manager.frame_count < 1:
+            time.sleep(0.01)
+        thread = self.manager.animation_thread
+
+        started = time.perf_counter()
+        self.manager.stop_animation()
+        self.assertLess(time.perf_counter() - started, 0.2)
+        self.assertFalse(thread.is_alive())
+
+    def test_target_fps_change_applies_mid_run(self):
+        self.manager.target_fps = 1
+        self.assertTrue(self.manager.start_animation("rainbow"))
+        try:
+            time.sleep(0.05)
+            self.manager.target_fps = 200
+            deadline = time.time() + 3.0
+            while time.time() < deadline and self.manager.frame_count < 20:
+                time.sleep(0.01)
+            frames = self.manager.frame_count
+        finally:
+            self.manager.stop_animation()
+        self.assertGreaterEqual(frames, 20)
+
+    def test_spin_wait_only_at_high_frame_rates(self):
+        self.assertFalse(AnimationManager._should_spin_wait(40))
+        self.assertFalse(AnimationManager._should_spin_wait(None))
+        self.assertTrue(AnimationManager._should_spin_wait(AnimationManager.SPIN_FPS_THRESHOLD))
+
+        self.manager.target_fps = 200
+        self.assertTrue(self.manager.start_animation("rainbow"))
+        time.sleep(0.1)
+        thread = self.manager.animation_thread
+        started = time.perf_counter()
+        self.manager.stop_animation()
+        self.assertLess(time.perf_counter() - started, 0.2)
+        self.assertFalse(thread.is_alive())
+
+    @unittest.skipUnless(hasattr(os, "sched_getaffinity"), "CPU affinity is Linux-only")
+    def test_animation_thread_can_be_pinned(self):
+        cpu = min(os.sched_getaffinity(0))
+        self.manager.cpu_pin = cpu
+        affinity = []
+
+        def run():
+            self.manager._apply_thread_scheduling()
+            affinity.append(os.sched_getaffinity(0))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(affinity, [{cpu}])
+
+    def test_fps_is_counted_over_fixed_windows(self):
+        self.assertEqual(self.manager._calculate_fps(), 0.0)
+
+        second = 1_000_000_000
+        for i in range(3):
+            self.manager._update_fps_tracking(i * second // 2)
+        # Partial first window: two intervals over one second
+        self.assertAlmostEqual(self.manager._calculate_fps(), 2.0)
+
+        for i in range(3, 5):
+            self.manager._update_fps_tracking(i * second // 2)
+        # Four frame intervals over the two second window
+        self.assertAlmostEqual(self.manager._calculate_fps(), 2.0)
+        self.assertEqual(self.manager._fps_window_frames, 0)
+
+        # Completed windows are averaged: (2 + 5) / 2
+        for i in range(1, 11):
+            self.manager._update_fps_tracking(2 * second + i * second // 5)
+        self.assertAlmostEqual(self.manager._calculate_fps(), 3.5)
+
+        # Only the last FPS_HISTORY_SIZE windows count
+        start = 4 * second
+        for _ in range(self.manager.FPS_HISTORY_SIZE):
+            for i in range(1, 21):
+                self.manager._update_fps_tracking(start + i * second // 10)
+            start += 2 * second
+        self.assertAlmostEqual(self.manager._calculate_fps(), 10.0)
+
+    def test_perf_ring_wraps_and_summarizes(self):
+        self.assertEqual(self.manager._get_perf_summary(), {})
+
+        size = self.manager.PERF_RING_SIZE
+        width = len(self.manager.PERF_KEYS)
+        self.manager._record_perf_samples([(1_000_000,) * width] * 10)
+        for _ in range(size // 10):
+            self.manager._record_perf_samples([(2_000_000,) * width] * 10)
+
+        summary = self.manager._get_perf_summary()
+        self.assertEqual(summary['samples'], size)
+        # The first ten (1ms) samples were overwritten by the wrap-around
+        self.assertAlmostEqual(summary['avg_frame_ms'], 2.0)
+        self.assertAlmostEqual(summary['last_generate_ms'], 2.0)
+
+
+    def test_animation_hash_matches_file_and_is_cached(self):
+        path = self.manager.plugin_loader.get_plugin_file("rainbow")
+        expected = hashlib.sha256(path.read_bytes()).hexdigest()
+
+        self.assertEqual(self.manager._compute_animation_hash("rainbow"), expected)
+        self.assertIn(str(path), self.manager._hash_cache)
+        self.assertEqual(self.manager._compute_animation_hash("rainbow"), expected)
+        self.assertIsNone(self.manager._compute_animation_hash("missing"))
+
+
+    def test_status_reuses_animation_info_until_params_change(self):
+        self.manager.target_fps = 5
+        self.assertTrue(self.manager.start_animation("rainbow"))
+        try:
+            info = self.manager.get_current_status()['animation_info']
+            self.assertEqual(info['name'], "Rainbow Cycle")
+            self.assertIs(self.manager.get_current_status()['animation_info'], info)
+
+            self.assertTrue(self.manager.update_animation_parameters({'brightness': 0.5}))
+            updated = self.manager.get_current_status()['animation_info']
+            self.assertIsNot(updated, info)
+            self.assertEqual(updated['current_params']['brightness'], 0.5)
+        finally:
+            self.manager.stop_animation()
+        self.assertIsNone(self.manager.get_current_status()['animation_info'])
+
+
+    def test_led_info_is_shared_between_payloads(self):
+        status = self.manager.get_current_status()
+        frame = self.manager.get_current_frame()
+        self.assertEqual(status['led_info'], {'total_leds': 8, 'strip_count': 2, 'leds_per_strip': 4})
+        self.assertIs(status['led_info'], frame['led_info'])
+
+
+    def test_plugin_metadata_is_memoized_until_reload(self):
+        info = self.manager.get_animation_info("rainbow")
+        self.assertIsNotNone(info)
+        self.assertIs(self.manager.get_animation_info("rainbow"), info)
+
+        listing = self.manager.list_animations()
+        self.assertIn(info, listing)
+        self.assertEqual(self.manager.list_animations(), listing)
+
+        # Metadata is built when plugins load, and a reload only touches its own entry
+        self.assertEqual(
+            set(self.manager._plugin_info_cache), set(self.manager.plugin_loader.loaded_plugins)
+        )
+        other = self.manager.get_animation_info("flame_burst")
+        self.assertTrue(self.manager.reload_animation("rainbow"))
+        self.assertIsNot(self.manager.get_animation_info("rainbow"), info)
+        self.assertIs(self.manager.get_animation_info("flame_burst"), other)
+        self.assertIsNone(self.manager.get_animation_info("missing"))
+
+
+    def test_generate_frame_into_matches_generate_frame(self):
+        animation_class = self.manager.plugin_loader.get_plugin("rainbow")
+        expected = animation_class(self.controller).generate_frame(0.0, 0)
+
+        buffer = [None] * self.controller.total_leds
+        animation_class(self.controller).generate_frame_into(0.0, 0, buffer)
+        self.assertEqual(buffer, expected)
+
+        # The base-class fallback pads short legacy frames with black
+        short = animation_class(self.controller)
+        short.generate_frame = lambda *_args: [(1, 1, 1)]
+        AnimationBase.generate_frame_into(short, 0.0, 0, buffer)
+        self.assertEqual(buffer, [(1, 1, 1)] + [(0, 0, 0)] * 7)
+
+
+    def test_frame_buffer_is_reused_between_frames(self):
+        animation_class = self.manager.plugin_loader.get_plugin("flame_burst")
+        animation = animation_class(self.controller)
+
+        first = animation.generate_frame(0.1, 0)
+        self.assertIs(first, animation.get_frame_buffer())
+        self.assertEqual(len(first), 8)
+        self.assertIs(animation.generate_frame(0.2, 1), first)
+
+        out = list(black_frame(8))
+        self.assertIsNone(animation.generate_frame_into(0.2, 1, out))
+        self.assertEqual(out, first)
+
+        self.controller.strip_count, self.controller.total_leds = 1, 4
+        animation.refresh_dimensions()
+        self.assertEqual(animation.get_strip_info(), (1, 4))
+        self.assertEqual(len(animation.generate_frame(0.3, 2)), 4)
+
+
+    def test_frame_color_helpers_match_per_pixel_helpers(self):
+        animation_class = self.manager.plugin_loader.get_plugin("rainbow")
+        animation = animation_class(self.controller, {'brightness': 0.4})
+        hues = [i / 7 for i in range(7)]
+
+        colors = animation.hsv_to_rgb_frame(hues, 0.9, 0.8)
+        self.assertEqual(colors, [animation.hsv_to_rgb(h, 0.9, 0.8) for h in hues])
+        self.assertEqual(animation.hsv_to_rgb_array((h, 0.9, 0.8) for h in hues), colors)
+
+        # Hue table lookups agree with the exact conversion on the 1/256 grid
+        grid = [i / 256 for i in range(0, 256, 17)]
+        self.assertEqual(animation.hue_array_to_rgb(grid), [animation.hsv_to_rgb(h, 1.0, 1.0) for h in grid])
+        self.assertEqual(animation.hue_to_rgb(-0.25), animation.hsv_to_rgb(0.75, 1.0, 1.0))
+        self.assertEqual(animation.hue_to_rgb(0.0, 0.0, 0.5), (127, 127, 127))
+        self.assertEqual(animation.hue_to_rgb(0.0, 1.0, 0.5), (127, 0, 0))
+
+        # The inlined scalar conversion matches colorsys, including hues outside [0, 1)
+        for h, s, v in [(-0.3, 0.5, 0.7), (1.2, 1.0, 1.0), (0.5, 0.0, 0.6), (0.99, 0.3, 0.2)]:
+            expected_rgb = tuple(int(c * 255) for c in colorsys.hsv_to_rgb(h, s, v))
+            self.assertEqual(animation.hsv_to_rgb(h, s, v), expected_rgb)
+            # Runs wrap such hues around the color wheel instead
+            wrapped_rgb = tuple(int(c * 255) for c in colorsys.hsv_to_rgb(h % 1.0, s, v))
+            self.assertEqual(animation.hsv_to_rgb_frame([h], s, v), [wrapped_rgb])
+            self.assertEqual(animation.compose_frame([h], s, v), [animation.apply_brightness(wrapped_rgb)])
+        self.assertEqual(list(HUE_LUT), [animation.hsv_to_rgb(i / 256, 1.0, 1.0) for i in range(256)])
+
+        expected = [animation.apply_brightness(c) for c in colors]
+        self.assertEqual(animation.compose_frame(hues, 0.9, 0.8), expected)
+        self.assertIs(animation.apply_brightness_frame(colors), colors)
+        self.assertEqual(colors, expected)
+        # Out-of-byte-range channels take the arithmetic path with the same result
+        odd = [(300, 2, 0)]
+        self.assertEqual(animation.apply_brightness_frame(odd), [((300 * 102) >> 8, 0, 0)])
+
+        # Brightness is Q8 fixed point: 0.4 -> 102/256
+        self.assertEqual(animation.apply_brightness((255, 100, 0)), (101, 39, 0))
+
+        # Gamma is applied after brightness and leaves black and full scale fixed
+        gamma = animation.compose_frame([0.0], 1.0, 1.0, gamma=True)
+        self.assertEqual(gamma, [(GAMMA_LUT[(255 * 102) >> 8], 0, 0)])
+        self.assertEqual((GAMMA_LUT[0], GAMMA_LUT[255]), (0, 255))
+
+
+    def test_scalar_hsv_matches_colorsys_across_sectors_and_edges(self):
+        # Every sector, both sides of each sector boundary, and the 0/1 edges
+        hues = [0.0, 1.0, 1 - 1e-9] + [k / 6 + d for k in range(6) for d in (-1e-9, 0.0, 1e-9, 1 / 12)]
+        levels = [0.0, 0.25, 0.5, 0.999, 1.0]
+        for h in hues:
+            for s in levels:
+                for v in levels:
+                    expected = tuple(int(c * 255) for c in colorsys.hsv_to_rgb(h, s, v))
+                    self.assertEqual(hsv_to_rgb255(h, s, v), expected, (h, s, v))
+                    if 0.0 <= h < 1.0:
+                        self.assertEqual(_hsv_run([h], s, v), [expected], (h, s, v))
+
+
+    def test_default_preview_is_cached_until_plugin_changes(self):
+        first = self.manager.get_animation_preview("flame_burst")
+        second = self.manager.get_animation_preview("flame_burst")
+        self.assertIs(second['frame_data'], first['frame_data'])
+        self.assertEqual(len(first['frame_data']), 8)
+
+        self.manager._preview_cache.clear()
+        self.assertEqual(self.manager.get_animation_preview("flame_burst")['frame_data'], first['frame_data'])
+
+        self.assertTrue(self.manager.reload_animation("flame_burst"))
+        third = self.manager.get_animation_preview("flame_burst")
+        self.assertIsNot(third['frame_data'], first['frame_data'])
+        self.assertEqual(third['frame_data'], first['frame_data'])
+
+
+    def test_start_refreshes_dimensions_changed_by_configure(self):
+        class ReconfiguringController(PreviewLEDController):
+            def configure(self):
+                self.strip_count, self.total_leds = 3, 12
+
+        controller = ReconfiguringController(strips=2, leds_per_strip=4)
+        manager = AnimationManager(controller, plugins_dir="animations")
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(manager.start_animation("rainbow"))
+            try:
+                animation = manager.current_animation
+                self.assertEqual(animation.get_strip_info(), (3, 4))
+                self.assertEqual(animation.get_pixel_count(), 12)
+                self.assertEqual(len(animation.generate_frame(0.0, 0)), 12)
+            finally:
+                manager.stop_animation()
+
+
+    def test_preview_rejects_unknown_names(self):
+        self.assertIn("rainbow", self.manager._known_names)
+        with self.assertRaises(ValueError):
+            self.manager.get_animation_preview("missing")
+        with self.assertRaises(ValueError):
+            self.manager.get_animation_preview_with_params("missing", {})
+
+
+    def test_reused_rainbow_preview_is_reset(self):
+        first = self.manager.get_animation_preview("rainbow")['frame_data']
+        instance = self.manager._preview_instances["rainbow"][1]
+        instance.hue_offset = 0.5
+        self.manager._preview_cache.clear()
+        self.assertEqual(self.manager.get_animation_preview("rainbow")['frame_data'], first)
+        self.assertIs(self.manager._preview_instances["rainbow"][1], instance)
+
+        self.assertTrue(self.manager.reload_animation("rainbow"))
+        self.assertNotIn("rainbow", self.manager._preview_instances)
+
+
+    def test_preview_builds_fresh_instances_without_reset(self):
+        # flame_burst keeps the no-op base reset(), so a reused instance could
+        # carry state from an earlier preview; it is never kept
+        animation_class = self.manager.plugin_loader.get_plugin("flame_burst")
+        self.assertIs(animation_class.reset, AnimationBase.reset)
+        built = []
+        original_init = animation_class.__init__
+
+        def counting_init(instance, *args, **kwargs):
+            built.append(instance)
+            original_init(instance, *args, **kwargs)
+
+        animation_class.__init__ = counting_init
+        try:
+            first = self.manager.get_animation_preview("flame_burst")['frame_data']
+            self.manager._preview_cache.clear()
+            second = self.manager.get_animation_preview("flame_burst")['frame_data']
+        finally:
+            animation_class.__init__ = original_init
+        self.assertEqual(len(built), 2)
+        self.assertIsNot(built[0], built[1])
+        self.assertEqual(second, first)
+        self.assertNotIn("flame_burst", self.manager._preview_instances)
+
+        # Overriding reset() opts the plugin in to instance reuse
+        resets = []
+        animation_class.reset = lambda instance: resets.append(instance)
+        try:
+            self.manager._preview_cache.clear()
+            self.manager.get_animation_preview("flame_burst")
+            instance = self.manager._preview_instances["flame_burst"][1]
+            self.manager._preview_cache.clear()
+            self.assertEqual(self.manager.get_animation_preview("flame_burst")['frame_data'], first)
+        finally:
+            del animation_class.reset
+        self.assertEqual(resets, [instance])
+
+
+    def test_generate_frame_bytes_packs_rgb(self):
+        animation_class = self.manager.plugin_loader.get_plugin("rainbow")
+        expected = animation_class(self.controller).generate_frame(0.0, 0)
+        packed = animation_class(self.controller).generate_frame_bytes(0.0, 0)
+        self.assertEqual(len(packed), 3 * 8)
+        self.assertEqual(list(packed[:3]), list(expected[0]))
+
+        # Out-of-range and float channels are masked the way the SPI layer expects
+        self.assertEqual(pack_frame_rgb([(256, -1, 7.9)], 2), bytearray([0, 255, 7, 0, 0, 0]))
+
+
+    def test_packed_byte_frames_are_accepted(self):
+        class PackedAnimation(AnimationBase):
+            def generate_frame(self, time_elapsed, frame_count):
+                frame = self.get_byte_buffer()
+                frame[0::3] = bytes([200]) * self.get_pixel_count()
+                return frame
+
+        animation = PackedAnimation(self.controller)
+        packed = animation.generate_frame(0.0, 0)
+        self.assertIs(animation.get_byte_buffer(), packed)
+        self.assertEqual(len(packed), 3 * 8)
+
+        frame = self.manager._normalize_frame(packed)
+        self.assertEqual(frame, [(200, 0, 0)] * 8)
+        self.assertEqual(self.manager._normalize_frame(packed[:6]), [(200, 0, 0)] * 2 + [(0, 0, 0)] * 6)
+        self.assertEqual(animation.generate_frame_bytes(0.0, 1), packed)
+
+        animation.update_parameters({'brightness': 0.4})
+        self.assertIs(animation.apply_brightness_bytes(packed), packed)
+        self.assertEqual(self.manager._normalize_frame(packed)[0], animation.apply_brightness((200, 0, 0)))
+        self.assertEqual(animation.apply_brightness_bytes(bytearray([255]), gamma=True),
+                         bytearray([GAMMA_LUT[(255 * 102) >> 8]]))
+        self.assertEqual(pack_frame_rgb(bytes([1, 2, 3]), 2), bytearray([1, 2, 3, 0, 0, 0]))
+
+    def test_u32_pixel_frames_pack_and_scale_like_tuples(self):
+        animation_class = self.manager.plugin_loader.get_plugin("rainbow")
+        animation = animation_class(self.controller, {'brightness': 0.4})
+        colors = [(255, 100, 0), (1, 2, 3), (0, 255, 17), (128, 64, 32)]
+
+        pixels = animation.frame_to_u32(colors)
+        self.assertEqual(pixels[0], 0xFF6400)
+        self.assertEqual(pack_frame_rgb(pixels, 5), pack_frame_rgb(colors, 5))
+        self.assertEqual(self.manager._normalize_frame(pixels), colors + [(0, 0, 0)] * 4)
+
+        self.assertIs(animation.apply_brightness_u32(pixels), pixels)
+        self.assertEqual(pack_frame_rgb(pixels, 4),
+                         pack_frame_rgb([animation.apply_brightness(c) for c in colors], 4))
+
+        buffer = animation.get_u32_buffer()
+        self.assertEqual(len(buffer), 8)
+        self.assertIs(animation.get_u32_buffer(), buffer)
+
+    def test_stateful_animation_reuses_its_worker_thread(self):
+        runs = []
+
+        class Holding(StatefulAnimationBase):
+            def run_animation(self):
+                runs.append(threading.current_thread())
+                self.stop_event.wait(2.0)
+
+        animation = Holding(self.controller)
+        animation.start()
+        worker = animation.animation_thread
+        animation.stop()
+        animation.start()
+        self.assertIs(animation.animation_thread, worker)
+        animation.stop()
+        self.assertEqual(runs, [worker, worker])
+
+        animation.cleanup()
+        worker.join(timeout=1.0)
+        self.assertFalse(worker.is_alive())
+
+    def test_stateful_restart_waits_for_a_slow_frame_in_flight(self):
+        class SlowFrame(StatefulAnimationBase):
+            STOP_TIMEOUT = 0.05
+
+            def __init__(self, controller):
+                super().__init__(controller)
+                self.runs = 0
+                self.slow = threading.Event()
+
+            def run_animation(self):
+                self.runs += 1
+                while not self.stop_event.is_set():
+                    if self.slow.is_set():
+                        # One frame that outlasts stop()'s wait
+                        self.slow.clear()
+                        time.sleep(0.3)
+                    else:
+                        time.sleep(0.005)
+
+        animation = SlowFrame(self.controller)
+        animation.start()
+        time.sleep(0.02)
+        animation.slow.set()
+        time.sleep(0.03)
+        animation.stop()
+        self.assertFalse(animation._done_event.is_set())
+
+        # The restart lets the slow run finish instead of letting it carry on
+        animation.start()
+        time.sleep(0.05)
+        self.assertEqual(animation.runs, 2)
+        animation.stop()
+        self.assertTrue(animation._done_event.is_set())
+        time.sleep(0.05)
+        self.assertEqual(animation.runs, 2)
+
+        worker = animation.animation_thread
+        animation.cleanup()
+        worker.join(timeout=1.0)
+        self.assertFalse(worker.is_alive())
+
+    def test_default_schema_is_shared_but_not_mutated_by_subclasses(self):
+        animation_class = self.manager.plugin_loader.get_plugin("rainbow")
+        animation = animation_class(self.controller, {'speed': 2.0})
+        schema = animation.get_parameter_schema()
+        self.assertIn('span_ratio', schema)
+        self.assertNotIn('span_ratio', AnimationBase.get_parameter_schema(animation))
+        self.assertIs(schema['speed'], AnimationBase.get_parameter_schema(animation)['speed'])
+        self.assertEqual(animation.params['speed'], 2.0)
+        json.dumps(animation.get_info())
+
+        info = animation.get_info()
+        animation.update_parameters({'speed': 3.0})
+        self.assertEqual(info['current_params']['speed'], 2.0)
+        self.assertEqual(animation.get_info()['current_params']['speed'], 3.0)
+        self.assertIs(animation.get_info()['parameters'], info['parameters'])
+
+    def test_config_reaches_hot_params_at_construction(self):
+        class PlainAnimation(AnimationBase):
+            def generate_frame(self, time_elapsed, frame_count):
+                return []
+
+        animation = PlainAnimation(self.controller, {'brightness': 0.5, 'speed': 2.0})
+        self.assertEqual((animation._brightness, animation._speed), (0.5, 2.0))
+        self.assertEqual(animation._brightness_q8, 128)
+        self.assertEqual(animation.apply_brightness((200, 100, 0)), (100, 50, 0))
+
+        rainbow = self.manager.plugin_loader.get_plugin("rainbow")(self.controller, {'brightness': 0.5})
+        self.assertEqual(rainbow._brightness_q8, 128)
+
+    def test_hot_params_follow_params_changes(self):
+        animation_class = self.manager.plugin_loader.get_plugin("rainbow")
+        # The plugin replaces self.params after the base __init__ with its own defaults
+        animation = animation_class(self.controller)
+        self.assertEqual(animation._speed, 0.3)
+        self.assertEqual(animation._brightness_q8, 256)
+
+        animation.update_parameters({'brightness': 0.5, 'color_value': 0.25})
+        self.assertEqual((animation._brightness, animation._color_value), (0.5, 0.25))
+        self.assertEqual(animation.apply_brightness((200, 100, 0)), (100, 50, 0))
+
+        animation.params = {'speed': 2.0}
+        self.assertEqual((animation._speed, animation._brightness), (2.0, 1.0))
+
+    def test_mix_linear_blends_in_linear_light(self):
+        for value in (0, 1, 2, 37, 128, 255):
+            color = (value, 255 - value, value // 2)
+            self.assertEqual(mix_linear(color, (9, 9, 9), 0.0), color)
+            self.assertEqual(mix_linear((9, 9, 9), color, 1.0), color)
+
+        # Half of full white in linear light is well above the sRGB midpoint
+        self.assertEqual(mix_linear((0, 0, 0), (255, 255, 255), 0.5), (186, 186, 186))
+        self.assertEqual(mix_linear((0, 0, 0), (300, -5, 255), 2.0), (255, 0, 255))
+
+    def test_sparkle_frames_match_per_pixel_blend(self):
+        animation_class = self.manager.plugin_loader.get_plugin("sparkle")
+        animation = animation_class(self.controller, {'brightness': 0.5, 'sparkle_probability': 0.3})
+
+        random.seed(11)
+        frames = [animation.generate_frame(0.0, i) for i in range(4)]
+
+        random.seed(11)
+        levels = [0.0] * 8
+        for frame in frames:
+            levels = [level * 0.9 for level in levels]
+            # Each draw is the geometric gap to the next sparkling pixel
+            index = -1
+            while True:
+                index += 1 + int(math.log(1.0 - random.random()) / math.log(1.0 - 0.3))
+                if index >= 8:
+                    break
+                levels[index] = 1.0
+            expected = [animation.apply_brightness(mix_linear((0, 0, 20), (255, 255, 255), level))
+                        for level in levels]
+            self.assertEqual(frame, expected)
+
+    def test_sparkle_spawn_rate_matches_probability(self):
+        self.manager.plugin_loader.get_plugin("sparkle")
+        spawn_indices = self.manager.plugin_loader.plugin_modules["sparkle"]._spawn_indices
+
+        random.seed(3)
+        for prob in (0.02, 0.3):
+            indices = spawn_indices(50000, prob)
+            self.assertEqual(indices, sorted(set(indices)))
+            self.assertAlmostEqual(len(indices) / 50000, prob, delta=0.01)
+        self.assertEqual(spawn_indices(5, 0.0), [])
+        self.assertEqual(spawn_indices(5, 1.0), [0, 1, 2, 3, 4])
+
+    def test_sparkle_drops_pixels_once_faded_out(self):
+        animation_class = self.manager.plugin_loader.get_plugin("sparkle")
+        animation = animation_class(self.controller, {'sparkle_probability': 1.0, 'fade_speed': 0.5})
+        animation.generate_frame(0.0, 0)
+        self.assertEqual(sorted(animation.sparkle_levels), list(range(8)))
+
+        # The schema minimum; seeded so no pixel respawns while the rest fade
+        animation.update_parameters({'sparkle_probability': 0.001})
+        random.seed(3)
+        for i in range(1, 30):
+            frame = animation.generate_frame(0.0, i)
+            if not animation.sparkle_levels:
+                break
+            # Every level still tracked must still be visible against the base
+            self.assertNotEqual(frame[0], (0, 0, 20))
+        self.assertEqual(animation.sparkle_levels, {})
+        self.assertEqual(frame, [(0, 0, 20)] * 8)
+        self.assertEqual(animation.generate_frame_bytes(0.0, 30), pack_frame_rgb(frame, 8))
+
+        # A color change reaches the next frame
+        animation.update_parameters({'base_red': 40})
+        self.assertEqual(animation.generate_frame(0.0, 34), [(40, 0, 20)] * 8)
+        self.assertEqual(animation.generate_frame_bytes(0.0, 35), pack_frame_rgb([(40, 0, 20)] * 8, 8))
+
+        animation.update_parameters({'sparkle_probability': 1.0})
+        self.assertNotEqual(animation.generate_frame(0.0, 36), [(40, 0, 20)] * 8)
+
+    def test_sparkle_tracks_only_pixels_off_the_base_color(self):
+        animation_class = self.manager.plugin_loader.get_plugin("sparkle")
+        controller = PreviewLEDController(strips=16, leds_per_strip=140)
+
+        def lifetime(animation):
+            # Frames a lone sparkle stays distinguishable from the base color
+            base, level, frames = animation._level_color(0.0), 1.0, 0
+            while animation._level_color(level) != base:
+                level *= animation._fade_speed
+                frames += 1
+            return frames
+
+        for config in ({}, {'brightness': 0.2}):
+            animation = animation_class(controller, config)
+            base = animation._level_color(0.0)
+            random.seed(11)
+            for i in range(400):
+                frame = animation.generate_frame(0.0, i)
+            # Exactly the pixels that render off the base color are tracked
+            lit = {index for index, color in enumerate(frame) if color != base}
+            self.assertEqual(set(animation.sparkle_levels), lit)
+            # ...so the tracked count stays near the share of pixels that
+            # spawned within one visible lifetime
+            expected = 2240 * (1 - (1 - 0.02) ** lifetime(animation))
+            self.assertLess(len(animation.sparkle_levels), 1.1 * expected)
+
+        # Dimmer output reaches the base color sooner, so fewer pixels are kept
+        self.assertLess(lifetime(animation), lifetime(animation_class(controller, {})))
+
+    def test_sparkle_bytes_match_packed_frames(self):
+        animation_class = self.manager.plugin_loader.get_plugin("sparkle")
+        config = {'brightness': 0.5, 'sparkle_probability': 0.3}
+        by_tuples = animation_class(self.controller, config)
+        by_bytes = animation_class(self.controller, config)
+
+        random.seed(5)
+        frames = [by_tuples.generate_frame(0.0, i) for i in range(6)]
+        random.seed(5)
+        sparse_frames = 0
+        for i, frame in enumerate(frames):
+            # Few lit pixels are written straight into the byte buffer; many
+            # lit pixels go through the packed tuple frame instead
+            sparse = 4 * len(by_bytes.sparkle_levels) <= 8
+            packed = by_bytes.generate_frame_bytes(0.0, i)
+            if sparse:
+                sparse_frames += 1
+                self.assertIs(packed, by_bytes.get_byte_buffer())
+            self.assertEqual(packed, pack_frame_rgb(frame, 8))
+        self.assertTrue(0 < sparse_frames < len(frames))
+
+    def test_sparkle_picks_up_parameter_updates(self):
+        animation_class = self.manager.plugin_loader.get_plugin("sparkle")
+        animation = animation_class(self.controller, {'sparkle_probability': 0.0})
+        self.assertEqual(animation.generate_frame(0.0, 0), [(0, 0, 20)] * 8)
+
+        animation.update_parameters({'base_red': 40, 'base_blue': 0})
+        self.assertEqual(animation.generate_frame(0.0, 1), [(40, 0, 0)] * 8)
+
+        animation.update_parameters({'sparkle_probability': 1.0, 'sparkle_green': 0})
+        self.assertEqual(animation.generate_frame(0.0, 2), [(255, 0, 255)] * 8)
+
+    def test_refresh_plugins_skips_reload_when_files_unchanged(self):
+        loader = self.manager.plugin_loader
+        calls = []
+        original = loader.load_all_plugins
+        loader.load_all_plugins = lambda **kwargs: calls.append(1) or original(**kwargs)
+
+        plugins = self.manager.refresh_plugins()
+        self.assertIn("rainbow", plugins)
+        self.assertEqual(calls, [])
+
+        self.manager.refresh_plugins(force=True)
+        self.assertEqual(calls, [1])
+
+    def test_deferred_plugins_load_on_first_use(self):
+        with redirect_stdout(io.StringIO()):
+            manager = AnimationManager(self.controller, plugins_dir="animations", preload_plugins=False)
+        loader = manager.plugin_loader
+
+        self.assertEqual(loader.loaded_plugins, {})
+        self.assertEqual(loader.plugin_manifest["rainbow"]["name"], "Rainbow Cycle")
+        self.assertIn("rainbow", manager._known_names)
+
+        info = manager.get_animation_info("rainbow")
+        self.assertEqual(info["name"], "Rainbow Cycle")
+        self.assertEqual(list(loader.loaded_plugins), ["rainbow"])
+        self.assertIsNone(manager.get_animation_info("not_a_plugin"))
+
+
+class AsciiDropTests(unittest.TestCase):
+    """ascii_drop is not in ALLOWED_PLUGINS, so load it straight from the directory"""
+
+    @classmethod
+    def setUpClass(cls):
+        loader = AnimationPluginLoader("animations")
+        loader.scan_plugins()
+        with redirect_stdout(io.StringIO()):
+            cls.animation_class = loader.load_plugin("ascii_drop")
+        cls.module = loader.plugin_modules["ascii_drop"]
+
+    def setUp(self):
+        self.controller = PreviewLEDController(strips=10, leds_per_strip=12)
+
+    def test_lit_pixels_match_bitmaps(self):
+        for char, bitmap in self.animation_class.CHARACTER_BITMAPS.items():
+            lit = {(dy, dx) for dy, row in enumerate(bitmap) for dx, cell in enumerate(row) if cell == 'X'}
+            self.assertEqual(set(self.animation_class.LIT_PIXELS[char]), lit)
+        self.assertEqual(self.animation_class.LIT_PIXELS[' '], [])
+
+    def test_grid_is_a_flat_byte_map(self):
+        animation = self.animation_class(self.controller)
+        self.assertEqual(animation.grid_state, bytearray(120))
+
+        animation._place_character_in_grid('I', 2, 0)
+        self.assertEqual(animation.grid_state[2], 1)
+        self.assertEqual(animation.grid_state.count(1), len(animation.LIT_PIXELS['I']))
+        self.assertEqual(animation._filled_count, len(animation.LIT_PIXELS['I']))
+        self.assertFalse(animation._is_screen_full())
+
+        # Row bit masks mirror the byte map for the row-at-a-time collision test
+        self.assertEqual(animation.ROW_MASKS['I'][0], 0b11111)
+        self.assertEqual(animation._row_bits[0], 0b11111 << 2)
+        check_landed = self.module._check_landed
+        masks = animation.LIT_ROWS['I']
+        self.assertEqual([dy for dy, _ in masks], [0, 1, 2, 3, 4, 5])
+        self.assertTrue(check_landed(-6, 2, masks, animation._row_bits, 10))
+        self.assertFalse(check_landed(-7, 2, masks, animation._row_bits, 10))
+        self.assertFalse(check_landed(-6, 7, masks, animation._row_bits, 10))
+
+        # Landing on already-filled cells doesn't count them twice
+        animation._place_character_in_grid('I', 2, 0)
+        self.assertEqual(animation._filled_count, len(animation.LIT_PIXELS['I']))
+
+        animation._filled_count = 97
+        self.assertTrue(animation._is_screen_full())
+        animation._reset_grid()
+        self.assertEqual((animation._filled_count, animation.grid_state.count(1)), (0, 0))
+
+    def test_render_overlays_falling_characters_and_serpentine(self):
+        animation = self.animation_class(self.controller, {'serpentine': True})
+        char_color = animation.apply_brightness((0, 255, 100))
+        background = animation.apply_brightness((0, 0, 5))
+
+        animation.grid_state[0] = 1
+        animation.falling_y, animation.falling_x, animation.falling_chars = [-4.0], [0], ['_']
+        frame = animation._render_frame(10, 12, animation.get_frame_buffer())
+        self.assertIs(frame, animation.get_frame_buffer())
+
+        self.assertEqual(len(frame), 120)
+        # '_' lights row 5 of the glyph, so strip 1: reversed by the serpentine wiring
+        lit = [i for i, color in enumerate(frame) if color == char_color]
+        self.assertEqual(lit, [0] + list(range(19, 24)))
+        self.assertEqual(frame[1], background)
+
+    def test_scaled_colors_are_cached_until_params_change(self):
+        animation = self.animation_class(self.controller, {'brightness': 0.5})
+        colors = animation._frame_colors()
+        self.assertEqual(colors, ((0, 0, 2), (0, 127, 50)))
+        self.assertIs(animation._frame_colors(), colors)
+
+        animation.update_parameters({'background_red': 200})
+        self.assertEqual(animation._frame_colors(), ((100, 0, 2), (0, 127, 50)))
+
+    def test_unchanged_frames_skip_rendering(self):
+        animation = self.animation_class(self.controller, {'drop_speed': 0.5, 'phrase': '_'})
+        renders = []
+        render = animation._render_frame
+        animation._render_frame = lambda *args: renders.append(1) or render(*args)
+
+        first = animation.generate_frame(0.0, 0)
+        self.assertEqual(len(renders), 1)
+        # Too slow to reach a new row yet: same pixels, no render
+        self.assertIs(animation.generate_frame(0.1, 1), first)
+        self.assertEqual(len(renders), 1)
+
+        animation.update_parameters({'background_blue': 40})
+        out = [None] * 120
+        animation.generate_frame_into(0.2, 2, out)
+        self.assertEqual(len(renders), 2)
+        self.assertEqual(out[0], (0, 0, 40))
+
+        # Buffers that already hold the unchanged frame are not copied into again
+        back = [None] * 120
+        animation.generate_frame_into(0.25, 3, back)
+        self.assertEqual(back, out)
+        out[0] = back[0] = None
+        animation.generate_frame_into(0.3, 4, out)
+        animation.generate_frame_into(0.35, 5, back)
+        self.assertEqual(len(renders), 2)
+        self.assertIsNone(out[0])
+        self.assertIsNone(back[0])
+
+        # A new render reaches both buffers again
+        animation.update_parameters({'background_blue': 60})
+        animation.generate_frame_into(0.4, 6, out)
+        animation.generate_frame_into(0.45, 7, back)
+        self.assertEqual(out[0], (0, 0, 60))
+        self.assertEqual(back, out)
+
+
+class WaveAnimationTests(unittest.TestCase):
+    """WaveAnimation shares effects.py with a Sparkle variant, so take it from the module"""
+
+    @classmethod
+    def setUpClass(cls):
+        loader = AnimationPluginLoader("animations")
+        loader.scan_plugins()
+        with redirect_stdout(io.StringIO()):
+            loader.load_plugin("effects")
+        cls.animation_class = loader.plugin_modules["effects"].WaveAnimation
+
+    def test_wave_tracks_per_pixel_formula(self):
+        animation = self.animation_class(PreviewLEDController(strips=3, leds_per_strip=10), {'brightness': 0.5})
+        frame = animation.generate_frame(0.3, 0)
+
+        self.assertEqual(len(frame), 30)
+        for led in (0, 3, 9):
+            phase = led / 10 * 2.0 * 2 * math.pi + 0.3 * 1.0 * 2 * math.pi
+            value = (math.sin(phase) + 1) / 2
+            expected = animation.apply_brightness(mix_linear((0, 0, 20), (0, 255, 255), value))
+            pixels = [frame[strip * 10 + led] for strip in range(3)]
+            self.assertEqual(pixels, [pixels[0]] * 3)
+            # The sine comes from a 1024-step table, so allow one 8-bit level of error
+            for actual, exact in zip(pixels[0], expected):
+                self.assertLessEqual(abs(actual - exact), 1)
+
+    def test_wave_bytes_match_packed_frames(self):
+        animation = self.animation_class(PreviewLEDController(strips=3, leds_per_strip=10), {'brightness': 0.5})
+        for t in (0.0, 0.3, 1.7):
+            self.assertEqual(animation.generate_frame_bytes(t, 0), pack_frame_rgb(animation.generate_frame(t, 0), 30))
+
+
+class EmojiAnimationTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        loader = AnimationPluginLoader("animations")
+        loader.scan_plugins()
+        with redirect_stdout(io.StringIO()):
+            cls.animation_class = loader.load_plugin("emoji")
+
+    def test_layout_is_reused_until_geometry_changes(self):
+        animation = self.animation_class(PreviewLEDController(strips=8, leds_per_strip=14), {'serpentine': True})
+        frame = animation.generate_frame(0.2, 0)
+        layout = animation._layout
+        self.assertEqual(len(frame), 8 * 14)
+        self.assertEqual(animation.generate_frame_bytes(0.2, 0), pack_frame_rgb(frame, 8 * 14))
+
+        # Eyes sit on pattern row 3 (strip 3, odd, so mirrored) at pattern columns 5 and 7
+        eye = animation.apply_brightness((20, 20, 20))
+        self.assertEqual(dict(layout)['E'], [3 * 14 + 13 - 5, 3 * 14 + 13 - 7])
+        self.assertEqual(frame[3 * 14 + 8], eye)
+
+        draw = animation._draw
+        animation.generate_frame(0.4, 1)
+        self.assertIs(animation._layout, layout)
+        self.assertIs(animation._draw, draw)
+
+        animation.update_parameters({'x_offset': 1})
+        frame = animation.generate_frame(0.4, 2)
+        self.assertIsNot(animation._layout, layout)
+        self.assertIsNot(animation._draw, draw)
+        self.assertEqual(animation.generate_frame_bytes(0.4, 2), pack_frame_rgb(frame, 8 * 14))
+        self.assertEqual(dict(animation._layout)['E'], [3 * 14 + 12 - 5, 3 * 14 + 12 - 7])
+
+    def test_palette_is_rebuilt_only_when_a_pulse_step_changes(self):
+        animation = self.animation_class(PreviewLEDController(strips=8, leds_per_strip=14), {'pulse_speed': 0.01})
+        animation.generate_frame(0.0, 0)
+        palette = animation._palette
+        animation.generate_frame(0.001, 1)
+        self.assertIs(animation._palette, palette)
+
+        animation.generate_frame(0.5, 2)
+        self.assertIsNot(animation._palette, palette)
+        palette = animation._palette
+        animation.update_parameters({'primary_red': 10})
+        animation.generate_frame(0.5, 3)
+        self.assertIsNot(animation._palette, palette)
+        self.assertEqual(animation._palette['F'][0], int(10 * (0.8 + 0.25 * animation._palette_key[0] / 256)))
+
+    def test_animation_loop_sends_the_packed_emoji_frame(self):
+        sent = []
+
+        class RecordingController(PreviewLEDController):
+            def set_all_pixels_bytes(self, rgb):
+                sent.append(rgb)
+
+        controller = RecordingController(strips=8, leds_per_strip=14)
+        with redirect_stdout(io.StringIO()):
+            manager = AnimationManager(controller, plugins_dir="animations")
+        config = {'emoji': '8', 'pulse_speed': 0.0, 'serpentine': True}
+        manager.current_animation = self.animation_class(controller, config)
+        threading.Timer(0.1, manager.stop_event.set).start()
+        manager._animation_loop()
+
+        expected = self.animation_class(controller, config).generate_frame(0.0, 0)
+        self.assertTrue(sent)
+        self.assertEqual(sent[-1], bytes(pack_frame_rgb(expected, 8 * 14)))
+        self.assertEqual(decode_frame_data(manager.get_current_frame()['frame_data_encoded']),
+                         [list(color) for color in expected])
+
+    def test_unchanged_colors_reuse_the_last_frame(self):
+        # '8' only shows face and background, which hold still without a pulse
+        animation = self.animation_class(PreviewLEDController(strips=8, leds_per_strip=14),
+                                         {'emoji': '8', 'pulse_speed': 0.0})
+        first = animation.generate_frame(0.0, 0)
+        self.assertIs(animation.generate_frame(1.3, 1), first)
+
+        animation.update_parameters({'brightness': 0.5})
+        dimmed = animation.generate_frame(1.3, 2)
+        self.assertIsNot(dimmed, first)
+        self.assertEqual(dimmed[0], animation.apply_brightness((2, 6, 12)))
+
+
+class DebugSequentialTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        loader = AnimationPluginLoader("animations")
+        loader.scan_plugins()
+        with redirect_stdout(io.StringIO()):
+            cls.animation_class = loader.load_plugin("debug_sequential")
+
+    def setUp(self):
+        with redirect_stdout(io.StringIO()):
+            self.animation = self.animation_class(PreviewLEDController(strips=2, leds_per_strip=3))
+
+    def test_advancing_only_moves_the_lit_led(self):
+        animation = self.animation
+        with redirect_stdout(io.StringIO()):
+            first = animation.generate_frame(0.0, 0)
+            self.assertEqual(first, [(0, 0, 0), (255, 255, 255)] + [(0, 0, 0)] * 4)
+            self.assertIs(animation.generate_frame(0.1, 1), first)
+            self.assertEqual(first[1], (255, 255, 255))
+
+            self.assertIs(animation.generate_frame(0.25, 2), first)
+            self.assertEqual(first, [(0, 0, 0)] * 2 + [(255, 255, 255)] + [(0, 0, 0)] * 3)
+
+            animation.reset()
+        self.assertEqual(first, [(0, 0, 0)] * 6)
+
+        animation.update_parameters({'brightness': 128, 'green': 0})
+        self.assertEqual(animation.lit_color, (128, 0, 128))
+
+
+PLUGIN_SOURCE = """
+from animation_system import AnimationBase
+
+
+class TinyAnimation(AnimationBase):
+    ANIMATION_NAME = "Tiny"
+
+    def generate_frame(self, time_elapsed, frame_count):
+        return [(1, 2, 3)] * self.get_pixel_count()
+"""
+
+
+class PluginLoaderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.plugins_dir = self._tmp.name
+        self.loader = AnimationPluginLoader(self.plugins_dir)
+
+    def write_plugin(self, name, source=PLUGIN_SOURCE):
+        path = os.path.join(self.plugins_dir, f"{name}.py")
+        with open(path, "w") as f:
+            f.write(source)
+        return path
+
+    def test_scan_is_cached_until_the_directory_changes(self):
+        self.assertEqual(self.loader.scan_plugins(), [])
+
+        # Hide the change from the cache by restoring the directory mtime
+        dir_stat = os.stat(self.plugins_dir)
+        self.write_plugin("tiny_scan")
+        os.utime(self.plugins_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+        self.assertEqual(self.loader.scan_plugins(), [])
+
+        self.loader.invalidate_scan_cache()
+        self.assertEqual(self.loader.scan_plugins(), ["tiny_scan"])
+
+        uncached = AnimationPluginLoader(self.plugins_dir, use_scan_cache=False)
+        self.assertEqual(uncached.scan_plugins(), ["tiny_scan"])
+        self.assertIsNone(uncached._scan_cache)
+
+    def test_lazy_registration_defers_module_execution(self):
+        self.write_plugin("tiny_lazy")
+        self.assertEqual(self.loader.load_all_plugins(lazy=True), {})
+        self.assertNotIn("tiny_lazy", self.loader.plugin_modules)
+
+        animation_class = self.loader.get_plugin("tiny_lazy")
+        self.assertEqual(animation_class.__name__, "TinyAnimation")
+        self.assertNotIn(os.path.abspath(self.plugins_dir), sys.path)
+        spec = self.loader.plugin_modules["tiny_lazy"].__spec__
+        self.assertEqual(spec.origin, os.path.join(os.path.abspath(self.plugins_dir), "tiny_lazy.py"))
+        self.assertIs(self.loader.get_plugin("tiny_lazy"), animation_class)
+
+        self.write_plugin("tiny_other")
+        self.loader.load_all_plugins(lazy=True)
+        self.assertEqual(set(self.loader.preload_all()), {"tiny_lazy", "tiny_other"})
+
+    def test_unchanged_plugins_are_not_re_executed(self):
+        self.write_plugin("tiny_cached")
+        first = self.loader.load_all_plugins()["tiny_cached"]
+        self.assertIs(self.loader.load_plugin("tiny_cached"), first)
+
+        with redirect_stdout(io.StringIO()):
+            reloaded = self.loader.reload_plugin("tiny_cached")
+        self.assertIsNot(reloaded, first)
+
+        self.write_plugin("tiny_cached", PLUGIN_SOURCE.replace('"Tiny"', '"Tiny v2"'))
+        changed = self.loader.load_plugin("tiny_cached")
+        self.assertIsNot(changed, reloaded)
+        self.assertEqual(changed.ANIMATION_NAME, "Tiny v2")
+
+    def test_plugin_info_is_cached_per_class_and_source(self):
+        self.write_plugin("tiny_info")
+        self.loader.load_all_plugins()
+        info = self.loader.get_plugin_info("tiny_info")
+        self.assertEqual(info["name"], "Tiny")
+        self.assertIs(self.loader.get_plugin_info("tiny_info"), info)
+
+        with redirect_stdout(io.StringIO()):
+            self.loader.reload_plugin("tiny_info")
+        self.assertIsNot(self.loader.get_plugin_info("tiny_info"), info)
+
+    def test_alphabetically_first_animation_class_is_picked(self):
+        self.write_plugin("tiny_pair", PLUGIN_SOURCE + "\n\nclass AlphaAnimation(TinyAnimation):\n    pass\n")
+        self.assertEqual(self.loader.load_all_plugins()["tiny_pair"].__name__, "AlphaAnimation")
+
+
+if __name__ == "__main__":
+    unittest.main()